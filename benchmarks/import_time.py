@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# modules that must not be imported by a plain `import evalbench`
+HEAVY_MODULES = (
+    'torch',
+    'transformers',
+    'sentence_transformers',
+    'bert_score',
+    'rouge_score',
+    'nltk',
+    'groq',
+)
+
+_SNIPPET = '''
+import json, sys, time
+start = time.perf_counter()
+import evalbench
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'heavy': [m for m in %r if m in sys.modules]}))
+''' % (HEAVY_MODULES,)
+
+def measure_import(runs=5):
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (src, env.get('PYTHONPATH')) if p)
+
+    samples = []
+    heavy = set()
+    for _ in range(runs):
+        # fresh interpreter per run so nothing is already cached in sys.modules
+        out = subprocess.run([sys.executable, '-c', _SNIPPET], env=env, check=True, capture_output=True, text=True)
+        record = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(record['seconds'])
+        heavy.update(record['heavy'])
+
+    return {
+        'runs': runs,
+        'median_seconds': round(statistics.median(samples), 4),
+        'max_seconds': round(max(samples), 4),
+        'heavy_modules_loaded': sorted(heavy),
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure the cost of `import evalbench`.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=None, help='fail if the median import time exceeds this (seconds)')
+    args = parser.parse_args()
+
+    report = measure_import(args.runs)
+    print(json.dumps(report, indent=2))
+
+    if report['heavy_modules_loaded']:
+        sys.exit('import evalbench loaded heavy modules: ' + ', '.join(report['heavy_modules_loaded']))
+    if args.budget is not None and report['median_seconds'] > args.budget:
+        sys.exit(f'import evalbench took {report["median_seconds"]}s, budget is {args.budget}s')
@@ -0,0 +1,49 @@
+import argparse
+import json
+import time
+from evalbench.runtime_setup.config import EvalConfig
+from evalbench.runtime_setup.runtime import set_config
+from evalbench.utils.llm_helper import complete_many
+from evalbench.utils.stub_server import StubLLMServer
+
+def run(concurrency, prompts, url, max_retries):
+    cfg = EvalConfig(
+        llm_backend='openai',
+        llm_base_url=url,
+        llm_api_key='stub',
+        judge_concurrency=concurrency,
+        llm_max_retries=max_retries,
+        llm_retry_base_delay=0.05,
+    )
+    set_config(cfg)
+    start = time.perf_counter()
+    complete_many(prompts, temperature=0)
+    elapsed = time.perf_counter() - start
+    cfg.close()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Judge request throughput against the local stub LLM server.')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--max-retries', type=int, default=5)
+    args = parser.parse_args()
+
+    prompts = [f'Rate item {i}.' for i in range(args.requests)]
+    results = []
+    with StubLLMServer(latency=args.latency, error_rate=args.error_rate, seed=0) as stub:
+        for concurrency in args.concurrency:
+            elapsed = run(concurrency, prompts, stub.url, args.max_retries)
+            results.append({
+                'concurrency': concurrency,
+                'seconds': round(elapsed, 3),
+                'requests_per_second': round(args.requests / elapsed, 1),
+                'server': stub.stats(),
+            })
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
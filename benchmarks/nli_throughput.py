@@ -0,0 +1,54 @@
+import argparse
+import json
+import random
+import time
+from evalbench.utils.nli_helper import NLIScorer
+
+_WORDS = (
+    'the model retrieved context answer paris france water boils at degrees celsius capital '
+    'of germany is berlin tower located in a very popular tourist site hunger poverty'
+).split()
+
+def _sentence(rng, min_words, max_words):
+    return ' '.join(rng.choices(_WORDS, k=rng.randint(min_words, max_words))).capitalize() + '.'
+
+def make_pairs(n, seed=0):
+    rng = random.Random(seed)
+    # mixed premise lengths, as in real RAG contexts
+    premises = [' '.join(_sentence(rng, 8, 25) for _ in range(rng.randint(1, 12))) for _ in range(n)]
+    hypotheses = [_sentence(rng, 6, 20) for _ in range(n)]
+    return premises, hypotheses
+
+def per_row(scorer, premises, hypotheses):
+    # the previous behaviour: one forward pass per row, no batching
+    return [scorer.predict([p], [h], batch_size=1)[0] for p, h in zip(premises, hypotheses)]
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare per-row and batched NLI throughput.')
+    parser.add_argument('--model', default='facebook/bart-large-mnli')
+    parser.add_argument('--rows', type=int, default=256)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[8, 16, 32])
+    args = parser.parse_args()
+
+    scorer = NLIScorer(args.model)
+    premises, hypotheses = make_pairs(args.rows)
+    scorer.predict(premises[:2], hypotheses[:2])  # warm up
+
+    report = {'rows': args.rows, 'model': args.model}
+    baseline = timed(per_row, scorer, premises, hypotheses)
+    report['per_row'] = {'seconds': round(baseline, 2), 'rows_per_second': round(args.rows / baseline, 1)}
+
+    for batch_size in args.batch_sizes:
+        elapsed = timed(scorer.predict, premises, hypotheses, batch_size=batch_size)
+        report[f'batched_{batch_size}'] = {
+            'seconds': round(elapsed, 2),
+            'rows_per_second': round(args.rows / elapsed, 1),
+            'speedup': round(baseline / elapsed, 2),
+        }
+
+    print(json.dumps(report, indent=2))
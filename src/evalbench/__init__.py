@@ -1,12 +1,18 @@
+import importlib
+from evalbench.metrics.index import PREDEFINED_METRICS, METRIC_EXPORTS
+from evalbench.utils.metrics_helper import build_metric_registry, register_metric, handle_output, show_metrics
+
+# predefined metrics are listed up front; their modules load on first use
+metric_registry = build_metric_registry(PREDEFINED_METRICS)
+__all__ = []
+
 from evalbench.runtime_setup.config import EvalConfig, load_config
 from evalbench.metrics.evaluate_module import evaluate_module
-from evalbench.utils.metrics_helper import expose_metrics, register_metric, handle_output, show_metrics
+from evalbench.metrics.evaluate_stream import evaluate_stream
 from evalbench.metrics.custom.custom_metrics import load_custom_metrics
 from evalbench.runtime_setup.runtime import set_config
-from evalbench.agents.run_agent import run_agent_pipeline
-
-metric_registry = {}
-__all__ = []
+from evalbench.runtime_setup.run_scope import run_scope
+from evalbench.utils.tokenization import get_token_cache
 
 MODULES = {
     'response_quality': 'metrics.predefined.response_quality',
@@ -17,16 +23,43 @@ MODULES = {
     'response_alignment': 'metrics.predefined.response_alignment',
 }
 
+# symbols resolved lazily on first attribute access -> module they live in
+LAZY_SYMBOLS = {
+    'run_agent_pipeline': 'agents.run_agent',
+    'get_cascade_stats': 'utils.cascade_helper',
+    'retrieval_curves': 'utils.retrieval_helper',
+    'evaluate_trec': 'utils.trec_loader',
+}
+
 EXPORTED_SYMBOLS = {
     'configs': ['EvalConfig', 'load_config', 'set_config'],
-    'module_evaluation': ['evaluate_module'],
+    'module_evaluation': ['evaluate_module', 'evaluate_stream'],
     'custom': ['load_custom_metrics'],
     'decorators': ['register_metric', 'handle_output'],
     'agent': ['run_agent_pipeline'],
-    'utils': ['show_metrics'],
+    'utils': ['show_metrics', 'run_scope', 'get_token_cache', 'get_cascade_stats', 'retrieval_curves', 'evaluate_trec'],
 }
 
-expose_metrics(MODULES)
-
 for group in EXPORTED_SYMBOLS.values():
     __all__.extend(group)
+__all__.extend(MODULES)
+__all__.extend(METRIC_EXPORTS)
+
+# lazily expose predefined metric modules, metric functions and heavy symbols
+def __getattr__(name):
+    if name in MODULES:
+        value = importlib.import_module(f'evalbench.{MODULES[name]}')
+    elif name in METRIC_EXPORTS:
+        module = importlib.import_module(f'evalbench.{MODULES[METRIC_EXPORTS[name]]}')
+        value = getattr(module, name)
+    elif name in LAZY_SYMBOLS:
+        module = importlib.import_module(f'evalbench.{LAZY_SYMBOLS[name]}')
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module 'evalbench' has no attribute '{name}'")
+
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
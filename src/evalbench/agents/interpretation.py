@@ -1,5 +1,6 @@
 from evalbench.runtime_setup.runtime import get_config
 from evalbench.utils.agent_helper import retry_with_backoff
+from evalbench.utils.llm_helper import complete
 
 
 class Interpretation:
@@ -64,10 +65,6 @@ class Interpretation:
             Metric Results: {metric_results}
             '''
 
-            response = self.cfg.groq_client.chat.completions.create(
-                model=self.cfg.llm,
-                messages=[{'role': 'user', 'content': prompt}],
-            )
-            return response.choices[0].message.content.strip()
+            return complete(prompt).strip()
 
         return retry_with_backoff(call)
\ No newline at end of file
@@ -3,11 +3,13 @@ from evalbench.agents.interpretation import Interpretation
 from evalbench.agents.module_selection import ModuleSelection
 from evalbench.agents.recommendation import Recommendation
 from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.checkpoint import fingerprint
 import evalbench.utils.agent_helper as helper
 from evalbench.utils.output_control import generate_report
 
 class Master:
-    def __init__(self):
+    def __init__(self, checkpoint=None):
+        self.checkpoint = checkpoint
         self.recommendation_agent = None
         self.interpretation_agent = None
         self.module_selector_agent = None
@@ -18,9 +20,24 @@ class Master:
         if not isinstance(instruction, str) or not instruction.strip():
             raise ValueError('Instruction must be a non-empty string that instructs the agent to perform a tas.')
 
-        steps_to_execute = ast.literal_eval(helper.plan_steps(instruction)) # identify the steps to execute (evaluation/interpretation/recommendation)
-        task = helper.get_task(instruction, data) # to assist in interpretation and recommendation
-        input_data = helper.parse_data(steps_to_execute, data) # parse data in the required form for downstream tasks
+        planned = None
+        if self.checkpoint:
+            # a resumed run must be for the same request and data
+            self.checkpoint.check_meta('agent_request', fingerprint({
+                'instruction': instruction, 'data': data, 'results': eval_results, 'interpretation': interpretation,
+            }))
+            planned = self.checkpoint.meta.get('request')
+        if planned:
+            # resumed run: reuse the plan instead of asking the LLM again
+            steps_to_execute, task, input_data = planned['steps'], planned['task'], planned['data']
+        else:
+            steps_to_execute = ast.literal_eval(helper.plan_steps(instruction)) # identify the steps to execute (evaluation/interpretation/recommendation)
+            task = helper.get_task(instruction, data) # to assist in interpretation and recommendation
+            input_data = helper.parse_data(steps_to_execute, data) # parse data in the required form for downstream tasks
+            if self.checkpoint:
+                self.checkpoint.set_meta('request', {
+                    'instruction': instruction, 'steps': steps_to_execute, 'task': task, 'data': input_data,
+                })
 
         self.request = {
             'instruction': instruction,
@@ -32,7 +49,7 @@ class Master:
         }
 
     def create_sub_agents(self):
-        self.module_selector_agent = ModuleSelection(self.request)
+        self.module_selector_agent = ModuleSelection(self.request, self.checkpoint)
         self.interpretation_agent = Interpretation(self.request)
         self.recommendation_agent = Recommendation(self.request)
 
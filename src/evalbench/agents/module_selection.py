@@ -1,11 +1,14 @@
 import ast
 import evalbench
+from evalbench.metrics.evaluate_module import evaluate_in_chunks
 from evalbench.runtime_setup.runtime import get_config
 from evalbench.utils.agent_helper import prepare_metric_inputs, retry_with_backoff
+from evalbench.utils.llm_helper import complete
 
 class ModuleSelection:
-    def __init__(self, parsed_request):
+    def __init__(self, parsed_request, checkpoint=None):
         self.cfg = get_config()
+        self.checkpoint = checkpoint
         self.parsed_request = parsed_request
         self.available_metrics = list(evalbench.metric_registry.keys())
         self.validated_metrics = []
@@ -63,13 +66,7 @@ class ModuleSelection:
             \'\'\'{self.parsed_request['instruction']}\'\'\'
             '''
 
-            response = self.cfg.groq_client.chat.completions.create(
-                model=self.cfg.llm,
-                messages=[{'role': 'user', 'content': prompt}],
-                temperature=0.5,
-            )
-
-            requested_metrics = response.choices[0].message.content.strip()
+            requested_metrics = complete(prompt, temperature=0.5).strip()
             requested_metrics = ast.literal_eval(requested_metrics)
             validated_metrics = [m for m in requested_metrics if m in self.available_metrics]
             return validated_metrics
@@ -77,7 +74,12 @@ class ModuleSelection:
         self.validated_metrics = retry_with_backoff(call)
 
     def execute(self):
-        self.determine_evaluation_metrics()
+        if self.checkpoint and 'agent_metrics' in self.checkpoint.meta:
+            self.validated_metrics = self.checkpoint.meta['agent_metrics']
+        else:
+            self.determine_evaluation_metrics()
+            if self.checkpoint:
+                self.checkpoint.set_meta('agent_metrics', self.validated_metrics)
         metric_inputs_map = prepare_metric_inputs(self.validated_metrics, self.parsed_request['data'])
 
         results = {}
@@ -86,7 +88,12 @@ class ModuleSelection:
             func = metric_info.get('func')
 
             try:
-                result = func(**inputs)
+                if self.checkpoint is None:
+                    result = func(**inputs)
+                else:
+                    # chunked, skipping rows already in the checkpoint
+                    entry = evaluate_in_chunks([metric], inputs, self.checkpoint)[0]
+                    result = entry['result'] if 'result' in entry else {'error': entry['error']}
                 results[metric] = result
             except Exception as e:
                 results[metric] = {'error': str(e)}
@@ -2,6 +2,7 @@ from jaraco.functools import retry
 
 from evalbench.runtime_setup.runtime import get_config
 from evalbench.utils.agent_helper import retry_with_backoff
+from evalbench.utils.llm_helper import complete
 
 
 class Recommendation:
@@ -75,12 +76,7 @@ class Recommendation:
             {interpretation if interpretation else self.parsed_request['interpretation']}
             '''
 
-            response = self.cfg.groq_client.chat.completions.create(
-                model=self.cfg.llm,
-                messages=[{'role': 'user', 'content': prompt}],
-                temperature=1,
-            )
-            return response.choices[0].message.content.strip()
+            return complete(prompt, temperature=1).strip()
 
         return retry_with_backoff(call)
 
@@ -1,11 +1,21 @@
+from contextlib import nullcontext
 from evalbench.agents.master import Master
 import evalbench.utils.output_control as print_control
 
-def run_agent_pipeline(instruction, data=None, results=None, interpretation=None):
+# `checkpoint` (a path or RunCheckpoint) records the planned request, the chosen
+# metrics and every finished (row, metric) result; `resume=True` reuses them.
+def run_agent_pipeline(instruction, data=None, results=None, interpretation=None, checkpoint=None, resume=False):
     print_control.suppress_printing()
 
-    master_agent = Master()
-    master_agent.handle_user_request(instruction, data, results, interpretation)
-    master_agent.create_sub_agents()
-    report = master_agent.execute()
+    if checkpoint is None:
+        scope = nullcontext()
+    else:
+        from evalbench.utils.checkpoint import checkpoint_scope
+        scope = checkpoint_scope(checkpoint, resume)
+
+    with scope as ckpt:
+        master_agent = Master(ckpt)
+        master_agent.handle_user_request(instruction, data, results, interpretation)
+        master_agent.create_sub_agents()
+        report = master_agent.execute()
     return report
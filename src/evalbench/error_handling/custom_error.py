@@ -6,6 +6,8 @@ class ErrorMessages(Enum):
     INVALID_STRING = '{param} must be a non-empty string.'
     MISSING_REQUIRED_PARAM = 'One/more required parameters missing.'
     LIST_LENGTH_MISMATCH = 'Inputs must be lists of equal length.'
+    CHECKPOINT_MISMATCH = 'Checkpoint {path} was written for different {what}; use a new checkpoint or resume=False.'
+    LLM_CACHE_MISS = 'No cached response for model {model} (key {key}) in LLM cache replay mode.'
 
     def format_message(self, **kwargs):
         return self.value.format(**kwargs)
@@ -31,16 +31,20 @@ def validate_batch_inputs(*args: Tuple[str, Union[List[str], List[List[str]]]]):
     validate_type_list_non_empty((param_1, batch_1), (param_2, batch_2))
     validate_list_length((param_1, batch_1), (param_2, batch_2))
 
-    for idx, item in enumerate(batch_1):
+    _validate_batch_items(param_1, batch_1)
+    _validate_batch_items(param_2, batch_2)
+
+def _strings_non_empty(items: list) -> bool:
+    # C-level check for the common case; str.strip raises TypeError on non-strings
+    try:
+        return all(map(str.strip, items))
+    except TypeError:
+        return False
+
+def _validate_batch_items(param_name: str, batch: list):
+    for item in batch:
         if isinstance(item, str):
-            validate_type_string_non_empty((param_1, item))
-        elif isinstance(item, list):
-            for jdx, inner_item in enumerate(item):
-                validate_type_string_non_empty((param_1, inner_item))
-
-    for idx, item in enumerate(batch_2):
-        if isinstance(item, str):
-            validate_type_string_non_empty((param_2, item))
-        elif isinstance(item, list):
-            for jdx, inner_item in enumerate(item):
-                validate_type_string_non_empty((param_2, inner_item))
\ No newline at end of file
+            validate_type_string_non_empty((param_name, item))
+        elif isinstance(item, list) and not _strings_non_empty(item):
+            for inner_item in item:
+                validate_type_string_non_empty((param_name, inner_item))
@@ -2,20 +2,161 @@ import os
 import evalbench
 from evalbench.error_handling.custom_error import Error, ErrorMessages
 from evalbench.metrics.custom.custom_metrics import load_custom_metrics
+from evalbench.runtime_setup.run_scope import get_run_cache, run_scope
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.metric_scheduler import ScheduleReport, run_scheduled
 
-def evaluate_module(module, **kwargs):
+# With `checkpoint` (a path or RunCheckpoint), rows are evaluated in chunks and
+# each finished (row, metric) result is recorded; `resume=True` reuses them.
+def evaluate_module(module, checkpoint=None, resume=False, **kwargs):
     if not module:
         raise Error(ErrorMessages.MISSING_REQUIRED_PARAM, param='module')
 
+    selected = select_metrics(module)
+    if checkpoint is None:
+        return evaluate_selected(selected, kwargs)
+
+    from evalbench.utils.checkpoint import checkpoint_scope, fingerprint
+
+    with checkpoint_scope(checkpoint, resume) as ckpt:
+        # rows are keyed by position, so a resumed run must see the same batch
+        ckpt.check_meta('evaluate_module', fingerprint({'metrics': selected, 'inputs': kwargs}))
+        return evaluate_in_chunks(selected, kwargs, ckpt)
+
+# registry names of the metrics in `module`, plus any listed in `metrics`
+# (by registry name or function name)
+def select_metrics(module=None, metrics=None):
+    module, metrics = module or [], metrics or []
+    return [
+        name for name, metric in evalbench.metric_registry.items()
+        if metric.get('module') in module or name in metrics or metric.get('func_name') in metrics
+    ]
+
+# `raw` calls the undecorated metric functions, skipping handle_output
+def evaluate_selected(selected, kwargs, raw=False):
+    cfg = get_config()
+    tasks = [
+        (name, evalbench.metric_registry[name].get('resource', 'cpu'), _metric_task(name, kwargs, raw))
+        for name in selected
+    ]
+    # judges wait for the fused prefetch; other resource classes start right away
+    setup = {'io': lambda: _prefetch_fused_judges(selected, kwargs)} if cfg.judge_fusion else None
+
+    # metrics in one module evaluation share per-run caches (e.g. tokenization)
+    with run_scope():
+        report = get_run_cache('schedule', ScheduleReport)
+        return run_scheduled(tasks, cfg.metric_concurrency, setup, report)
+
+def _metric_task(name, kwargs, raw=False):
+    def task():
+        metric = evalbench.metric_registry[name]
+        required_args = metric['required_args']
+        try:
+            args = {arg: kwargs[arg] for arg in required_args}
+            func = metric['func']
+            if raw:
+                func = getattr(func, '__wrapped__', func)
+            return {'metric': name, 'result': func(**args)}
+        except Exception as e:
+            return {'metric': name, 'error': str(e)}
+    return task
+
+# per-row inputs: lists as long as the batch; anything else (e.g. k) is shared
+def _batch_size(selected, kwargs):
+    for name in selected:
+        for arg in evalbench.metric_registry[name]['required_args']:
+            if isinstance(kwargs.get(arg), list):
+                return len(kwargs[arg])
+    return None
+
+def _take_rows(kwargs, indices, size):
+    return {
+        key: [value[i] for i in indices] if isinstance(value, list) and len(value) == size else value
+        for key, value in kwargs.items()
+    }
+
+# Evaluate the rows `row_ids` (aligned with the lists in kwargs), skipping
+# (row, metric) results already in the checkpoint and recording new ones.
+# Returns the [{metric, result}] entries and, per metric, the row positions
+# computed in this call (the rest were restored). With record=False the caller
+# records them via record_computed once the results are stored elsewhere.
+# `digests` (input fingerprints aligned with row_ids) guard against reusing
+# results recorded for different row contents.
+def evaluate_checkpointed(selected, kwargs, row_ids, checkpoint, raw=False, record=True, digests=None):
+    from evalbench.utils.checkpoint import MISSING
+
+    size = len(row_ids)
+    digests = digests or [None] * size
+    outputs = {
+        name: [checkpoint.get(row, name, digest=digest) for row, digest in zip(row_ids, digests)]
+        for name in selected
+    }
+    pending = [i for i in range(size) if any(outputs[name][i] is MISSING for name in selected)]
+    needed = [name for name in selected if any(outputs[name][i] is MISSING for i in pending)]
+    computed = {name: [] for name in selected}
+    errors = {}
+
+    if pending and needed:
+        for entry in evaluate_selected(needed, _take_rows(kwargs, pending, size), raw):
+            name, result = entry['metric'], entry.get('result')
+            if 'error' in entry or isinstance(result, dict) and 'error' in result:
+                errors[name] = entry.get('error') or result['error']
+            elif not isinstance(result, list) or len(result) != len(pending):
+                errors[name] = f'{name} does not return one result per row and cannot be checkpointed'
+            else:
+                for i, output in zip(pending, result):
+                    if outputs[name][i] is MISSING:
+                        outputs[name][i] = output
+                        computed[name].append(i)
+
     results = []
-    for name, metric in evalbench.metric_registry.items():
-        if metric.get('module') in module:
-            required_args = metric['required_args']
-            try:
-                args = {arg: kwargs[arg] for arg in required_args}
-                result = metric['func'](**args)
-                results.append({'metric': name, 'result': result})
-            except Exception as e:
-                results.append({'metric': name, 'error': str(e)})
-
-    return results
\ No newline at end of file
+    for name in selected:
+        if name in errors:
+            results.append({'metric': name, 'error': errors[name]})
+        else:
+            results.append({'metric': name, 'result': outputs[name]})
+    if record:
+        record_computed(checkpoint, results, row_ids, computed, digests)
+    return results, computed
+
+def record_computed(checkpoint, results, row_ids, computed, digests=None):
+    for entry in results:
+        for i in computed.get(entry['metric'], ()):
+            checkpoint.record(row_ids[i], entry['metric'], entry['result'][i], digests[i] if digests else None)
+    checkpoint.flush()
+
+# evaluate_module over the whole batch, cfg.stream_chunk_size rows at a time,
+# so results are checkpointed as they finish
+def evaluate_in_chunks(selected, kwargs, checkpoint):
+    size = _batch_size(selected, kwargs)
+    if size is None:
+        return evaluate_selected(selected, kwargs)
+
+    chunk_size = get_config().stream_chunk_size
+    outputs = {name: [] for name in selected}
+    errors = {}
+    for start in range(0, size, chunk_size):
+        indices = list(range(start, min(start + chunk_size, size)))
+        results, _ = evaluate_checkpointed(selected, _take_rows(kwargs, indices, size), indices, checkpoint)
+        for entry in results:
+            if 'error' in entry:
+                errors.setdefault(entry['metric'], entry['error'])
+            elif isinstance(entry['result'], list):
+                outputs[entry['metric']].extend(entry['result'])
+
+    return [
+        {'metric': name, 'error': errors[name]} if name in errors else {'metric': name, 'result': outputs[name]}
+        for name in selected
+    ]
+
+# score judge metrics that share inputs with one multi-criteria prompt per item
+def _prefetch_fused_judges(selected, kwargs):
+    from evalbench.utils.judge_helper import prefetch_fused_scores
+
+    metrics = []
+    for name in selected:
+        # resolving 'func' imports the metric module, which registers its rubric
+        evalbench.metric_registry[name]['func']
+        metrics.append(evalbench.metric_registry[name])
+
+    prefetch_fused_scores(metrics, kwargs)
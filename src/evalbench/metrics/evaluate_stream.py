@@ -0,0 +1,106 @@
+import os
+import time
+from contextlib import nullcontext
+from evalbench.error_handling.custom_error import Error, ErrorMessages
+from evalbench.metrics.evaluate_module import evaluate_checkpointed, evaluate_selected, record_computed, select_metrics
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.checkpoint import checkpoint_scope, fingerprint
+from evalbench.utils.stream_helper import RecordSink, chunked, iter_records
+import evalbench
+
+# Evaluate a dataset too large to hold in memory. Rows are read lazily from a
+# JSONL/CSV file (or any iterable of dicts) and scored `chunk_size` at a time;
+# each chunk's results are written to `sink` as one record per (row, metric)
+# before the next chunk is read, so memory stays flat however long the file is.
+#   columns:   {metric argument: dataset column} where the names differ
+#   id_field:  column used as the row id (default: the row's position)
+#   **params:  arguments shared by every row, e.g. k=5 for retrieval metrics
+# With `checkpoint`, finished (row, metric) results are recorded as well, and
+# `resume=True` skips them, writing only the missing records to the sink.
+def evaluate_stream(dataset, module=None, metrics=None, sink=None, chunk_size=None, columns=None,
+                    id_field=None, format=None, checkpoint=None, resume=False, **params):
+    if not module and not metrics:
+        raise Error(ErrorMessages.MISSING_REQUIRED_PARAM, param='module')
+
+    cfg = get_config()
+    selected = select_metrics(module, metrics)
+    if not selected:
+        raise ValueError(f'No metrics match module={module} metrics={metrics}')
+    chunk_size = chunk_size or cfg.stream_chunk_size
+    rows = iter_records(dataset, format) if isinstance(dataset, (str, os.PathLike)) else iter(dataset)
+
+    summary = {'rows': 0, 'chunks': 0, 'records': 0, 'errors': 0}
+    start = time.perf_counter()
+    with RecordSink(sink or cfg.output_filepath) as out, _checkpoint(checkpoint, resume) as ckpt:
+        if ckpt is not None:
+            # each row's contents are checked through its own fingerprint as it is read
+            ckpt.check_meta('evaluate_stream', fingerprint({
+                'metrics': selected, 'params': params, 'columns': columns, 'id_field': id_field,
+            }))
+        for chunk in chunked(rows, chunk_size):
+            row_ids = [row[id_field] for row in chunk] if id_field else list(range(summary['rows'], summary['rows'] + len(chunk)))
+            inputs = _chunk_inputs(chunk, selected, columns, params)
+            if ckpt is None:
+                records = list(row_records(evaluate_selected(selected, inputs, raw=True), row_ids))
+                out.write_many(records)
+            else:
+                digests = [fingerprint(row) for row in chunk]
+                results, computed = evaluate_checkpointed(
+                    selected, inputs, row_ids, ckpt, raw=True, record=False, digests=digests,
+                )
+                records = list(row_records(results, row_ids, computed))
+                # rows are only marked done once their records are durably in the sink
+                out.write_many(records)
+                out.sync()
+                record_computed(ckpt, results, row_ids, computed, digests)
+            summary['rows'] += len(chunk)
+            summary['chunks'] += 1
+            summary['errors'] += sum(1 for record in records if 'error' in record)
+
+    summary['records'] = out.records
+    if ckpt is not None:
+        summary['checkpoint'] = ckpt.stats()
+    summary['seconds'] = round(time.perf_counter() - start, 4)
+    return summary
+
+# metric arguments for one chunk: shared params as given, everything else as a column
+def _chunk_inputs(chunk, selected, columns, params):
+    columns = columns or {}
+    inputs = dict(params)
+    for name in selected:
+        for arg in evalbench.metric_registry[name]['required_args']:
+            if arg in inputs:
+                continue
+            column = columns.get(arg, arg)
+            # rows missing the column leave the argument out; the metric reports it
+            if all(column in row for row in chunk):
+                inputs[arg] = [row[column] for row in chunk]
+    return inputs
+
+def _checkpoint(checkpoint, resume):
+    return nullcontext() if checkpoint is None else checkpoint_scope(checkpoint, resume)
+
+# [{metric, result | error}] for one chunk -> one record per (row, metric);
+# with `computed` ({metric: row positions}) only those rows' results are kept
+def row_records(results, row_ids, computed=None):
+    for entry in results:
+        metric = entry['metric']
+        if computed is not None and 'error' not in entry:
+            result = entry['result']
+            for i in computed[metric]:
+                yield {'row': row_ids[i], 'metric': metric, 'output': result[i]}
+            continue
+        if 'error' in entry:
+            for row_id in row_ids:
+                yield {'row': row_id, 'metric': metric, 'error': entry['error']}
+            continue
+
+        result = entry['result']
+        if isinstance(result, dict) and 'error' in result:
+            for row_id in row_ids:
+                yield {'row': row_id, 'metric': metric, 'error': result['error']}
+        elif isinstance(result, list) and len(result) == len(row_ids):
+            for row_id, output in zip(row_ids, result):
+                yield {'row': row_id, 'metric': metric, 'output': output}
+        else:
+            yield {'rows': row_ids, 'metric': metric, 'output': result}
@@ -0,0 +1,136 @@
+from typing import List
+
+# Static description of the predefined metrics, mirroring their @register_metric
+# declarations. It lets `evalbench.metric_registry` be listed (and `import evalbench`
+# stay cheap) without importing the metric modules and their heavy dependencies.
+PREDEFINED_METRICS = {
+    'conciseness_score': {
+        'func_name': 'conciseness_score',
+        'required_args': ['response'],
+        'arg_types': [List[str]],
+        'module': 'response_quality',
+        'resource': 'io',
+    },
+    'coherence_score': {
+        'func_name': 'coherence_score',
+        'required_args': ['response'],
+        'arg_types': [List[str]],
+        'module': 'response_quality',
+        'resource': 'io',
+    },
+    'factuality_score': {
+        'func_name': 'factuality_score',
+        'required_args': ['response'],
+        'arg_types': [List[str]],
+        'module': 'response_quality',
+        'resource': 'model',
+    },
+    'bleu_score': {
+        'func_name': 'bleu_score',
+        'required_args': ['reference', 'generated'],
+        'arg_types': [List[str], List[str]],
+        'module': 'reference_based',
+        'resource': 'cpu',
+    },
+    'rouge_score': {
+        'func_name': 'rouge_score',
+        'required_args': ['reference', 'generated'],
+        'arg_types': [List[str], List[str]],
+        'module': 'reference_based',
+        'resource': 'cpu',
+    },
+    'meteor_score': {
+        'func_name': 'meteor_score',
+        'required_args': ['reference', 'generated'],
+        'arg_types': [List[str], List[str]],
+        'module': 'reference_based',
+        'resource': 'cpu',
+    },
+    'semantic_similarity_score': {
+        'func_name': 'semantic_similarity_score',
+        'required_args': ['reference', 'generated'],
+        'arg_types': [List[str], List[str]],
+        'module': 'reference_based',
+        'resource': 'model',
+    },
+    'bert_score': {
+        'func_name': 'bert_score',
+        'required_args': ['reference', 'generated'],
+        'arg_types': [List[str], List[str]],
+        'module': 'reference_based',
+        'resource': 'model',
+    },
+    'faithfulness_score': {
+        'func_name': 'faithfulness_score',
+        'required_args': ['context', 'generated'],
+        'arg_types': [List[List[str]], List[str]],
+        'module': 'contextual_generation',
+        'resource': 'model',
+    },
+    'hallucination_score': {
+        'func_name': 'hallucination_score',
+        'required_args': ['context', 'generated'],
+        'arg_types': [List[List[str]], List[str]],
+        'module': 'contextual_generation',
+        'resource': 'model',
+    },
+    'groundedness_score': {
+        'func_name': 'groundedness_score',
+        'required_args': ['context', 'generated'],
+        'arg_types': [List[List[str]], List[str]],
+        'module': 'contextual_generation',
+        'resource': 'io',
+    },
+    'recall_at_k_score': {
+        'func_name': 'recall_at_k',
+        'required_args': ['relevant_docs', 'retrieved_docs', 'k'],
+        'arg_types': [List[List[str]], List[List[str]], int],
+        'module': 'retrieval',
+        'resource': 'cpu',
+    },
+    'precision_at_k_score': {
+        'func_name': 'precision_at_k',
+        'required_args': ['relevant_docs', 'retrieved_docs', 'k'],
+        'arg_types': [List[List[str]], List[List[str]], int],
+        'module': 'retrieval',
+        'resource': 'cpu',
+    },
+    'ndcg_at_k_score': {
+        'func_name': 'ndcg_at_k',
+        'required_args': ['relevant_docs', 'retrieved_docs', 'k'],
+        'arg_types': [List[List[str]], List[List[str]], int],
+        'module': 'retrieval',
+        'resource': 'cpu',
+    },
+    'mrr_score': {
+        'func_name': 'mrr_score',
+        'required_args': ['retrieved_docs', 'relevant_docs', 'k'],
+        'arg_types': [List[List[str]], List[List[str]], int],
+        'module': 'retrieval',
+        'resource': 'cpu',
+    },
+    'context_relevance_score': {
+        'func_name': 'context_relevance_score',
+        'required_args': ['query', 'context'],
+        'arg_types': [List[str], List[str]],
+        'module': 'query_alignment',
+        'resource': 'io',
+    },
+    'response_relevance_score': {
+        'func_name': 'response_relevance_score',
+        'required_args': ['query', 'response'],
+        'arg_types': [List[str], List[str]],
+        'module': 'response_alignment',
+        'resource': 'io',
+    },
+    'response_helpfulness_score': {
+        'func_name': 'response_helpfulness_score',
+        'required_args': ['query', 'response'],
+        'arg_types': [List[str], List[str]],
+        'module': 'response_alignment',
+        'resource': 'io',
+    },
+}
+
+# public function name -> module it lives in
+METRIC_EXPORTS = {meta['func_name']: meta['module'] for meta in PREDEFINED_METRICS.values()}
@@ -1,89 +1,89 @@
+import threading
 from typing import List, Dict
-from nltk.translate.bleu_score import sentence_bleu
-from rouge_score import rouge_scorer
-from nltk.translate.meteor_score import meteor_score as meteor
-from nltk.tokenize import word_tokenize
-import bert_score as bert
-from sentence_transformers import util
 from evalbench.utils.metrics_helper import get_config, handle_output, register_metric
+from evalbench.utils.embedding_helper import encode_texts, rowwise_cosine
+from evalbench.utils.parallel_helper import map_rows
+import evalbench.utils.lexical_helper as lexical
 import evalbench.error_handling.validation_helpers as validation
 
 @register_metric(
     'bleu',
     required_args=['reference', 'generated'],
     arg_types=[List[str], List[str]],
-    module='reference_based'
+    module='reference_based',
+    resource='cpu'
 )
 @handle_output()
 def bleu_score(reference: List[str], generated: List[str]) -> List[float]:
     validation.validate_batch_inputs(('reference', reference), ('generated', generated))
 
-    return [
-        round(sentence_bleu([word_tokenize(ref)], word_tokenize(gen)), 2)
-        for ref, gen in zip(reference, generated)
-    ]
+    return map_rows(lexical.bleu_rows, reference, generated)
 
 @register_metric(
     'rouge',
     required_args=['reference', 'generated'],
     arg_types=[List[str], List[str]],
-    module='reference_based')
+    module='reference_based',
+    resource='cpu')
 @handle_output()
 def rouge_score(reference: List[str], generated: List[str]) -> List[Dict[str, float]]:
     validation.validate_batch_inputs(('reference', reference), ('generated', generated))
 
-    scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
-    return [
-        {k: round(v.fmeasure, 2) for k, v in scorer.score(ref, gen).items()}
-        for ref, gen in zip(reference, generated)
-    ]
+    return map_rows(lexical.rouge_rows, reference, generated)
 
 @register_metric(
     'meteor',
     required_args=['reference', 'generated'],
     arg_types=[List[str], List[str]],
-    module='reference_based'
+    module='reference_based',
+    resource='cpu'
 )
 @handle_output()
 def meteor_score(reference: List[str], generated: List[str]) -> List[float]:
     validation.validate_batch_inputs(('reference', reference), ('generated', generated))
 
-    return [
-        round(meteor([word_tokenize(ref)], word_tokenize(gen)), 2)
-        for ref, gen in zip(reference, generated)
-    ]
+    return map_rows(lexical.meteor_rows, reference, generated)
 
 @register_metric(
     'semantic_similarity',
     required_args=['reference', 'generated'],
     arg_types=[List[str], List[str]],
-    module='reference_based'
+    module='reference_based',
+    resource='model'
 )
 @handle_output()
-def semantic_similarity_score(reference: List[str], generated: List[str]) -> List[float]:
+def semantic_similarity_score(reference: List[str], generated: List[str], batch_size: int = None) -> List[float]:
     validation.validate_batch_inputs(('reference', reference), ('generated', generated))
 
-    cfg = get_config()
+    # one batched pass over the distinct strings of both sides
+    embeddings = encode_texts(reference + generated, batch_size=batch_size)
+    similarities = rowwise_cosine(embeddings[:len(reference)], embeddings[len(reference):])
 
-    return [
-        round(util.pytorch_cos_sim(
-            cfg.sentence_model.encode(ref, convert_to_tensor=True),
-            cfg.sentence_model.encode(gen, convert_to_tensor=True)
-        ).item(), 2)
-        for ref, gen in zip(reference, generated)
-    ]
+    return [round(float(sim), 2) for sim in similarities]
+
+_bert_idf_lock = threading.Lock()
 
 @register_metric(
     'bert',
     required_args=['reference', 'generated'],
     arg_types=[List[str], List[str]],
-    module='reference_based'
+    module='reference_based',
+    resource='model'
 )
 @handle_output()
 def bert_score(reference: List[str], generated: List[str]) -> List[Dict[str, float]]:
     validation.validate_batch_inputs(('reference', reference), ('generated', generated))
 
-    precision, recall, f1 = bert.score(generated, reference, lang='en', verbose=False)
+    cfg = get_config()
+
+    # the scorer (weights, tokenizer) is loaded once and reused across calls
+    if cfg.bert_idf:
+        # idf weights live on the shared scorer, so compute and use them atomically
+        with _bert_idf_lock:
+            cfg.bert_scorer.compute_idf(reference)
+            precision, recall, f1 = cfg.bert_scorer.score(generated, reference, verbose=False)
+    else:
+        precision, recall, f1 = cfg.bert_scorer.score(generated, reference, verbose=False)
     return [
         {
             'precision': round(precision[i].item(), 2),
@@ -0,0 +1,104 @@
+import json
+
+# LLM backends: an async `create(**request)` taking chat-completion arguments
+# (model, messages, temperature, ...) and returning either a completion or a raw
+# response with `.headers` and `.parse()`, so rate-limit headers reach the limiter.
+class LLMBackend:
+    name = 'backend'
+
+    async def create(self, **request):
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+class GroqBackend(LLMBackend):
+    name = 'groq'
+
+    def __init__(self, client):
+        # a LazyResource, so the SDK is only imported on the first request
+        self.client = client
+
+    async def create(self, **request):
+        return await self.client.chat.completions.with_raw_response.create(**request)
+
+class BackendError(Exception):
+    def __init__(self, status_code, response, message=None):
+        super().__init__(message or f'LLM backend returned HTTP {status_code}')
+        self.status_code = status_code
+        self.response = response
+
+class RawResponse:
+    def __init__(self, response):
+        self.headers = response.headers
+        self._response = response
+
+    def parse(self):
+        from evalbench.utils.llm_cache import to_namespace
+        return to_namespace(self._response.json())
+
+# Any OpenAI-compatible /chat/completions endpoint (OpenAI, vLLM, local servers,
+# the bundled stub server), over one pooled keep-alive HTTP/1.1 client.
+class OpenAICompatibleBackend(LLMBackend):
+    name = 'openai'
+
+    def __init__(self, base_url, api_key=None, max_connections=100, timeout=60.0):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+
+            headers = {'Authorization': f'Bearer {self.api_key}'} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            )
+        return self._client
+
+    async def create(self, **request):
+        response = await self._get_client().post('/chat/completions', content=json.dumps(request))
+        if response.status_code >= 400:
+            raise BackendError(response.status_code, response, f'LLM backend returned HTTP {response.status_code}: {response.text[:200]}')
+        return RawResponse(response)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+# wraps an async callable, e.g. the older `async_transport` option or a test fake
+class CallableBackend(LLMBackend):
+    name = 'callable'
+
+    def __init__(self, func):
+        self.func = func
+
+    async def create(self, **request):
+        return await self.func(**request)
+
+BACKENDS = ('groq', 'openai')
+
+def load_backend(backend, cfg):
+    if isinstance(backend, LLMBackend):
+        return backend
+    if callable(backend):
+        return CallableBackend(backend)
+    if backend == 'groq':
+        return GroqBackend(cfg.async_groq_client)
+    if backend == 'openai':
+        if not cfg.llm_base_url:
+            raise ValueError('llm_base_url is required for the openai backend.')
+        return OpenAICompatibleBackend(
+            cfg.llm_base_url,
+            api_key=cfg.llm_api_key,
+            max_connections=cfg.llm_max_connections,
+            timeout=cfg.llm_timeout,
+        )
+    raise ValueError(f'Unknown LLM backend: {backend}. Expected one of {list(BACKENDS)} or an LLMBackend.')
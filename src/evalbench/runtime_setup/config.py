@@ -1,10 +1,11 @@
 import os
 import json
-import yaml
-from sentence_transformers import SentenceTransformer
-from transformers import pipeline
-from groq import Groq
+import weakref
+from evalbench.runtime_setup.resources import LazyResource
+from evalbench.runtime_setup.model_pool import model_key, pooled_resource, release_resources
+from evalbench.runtime_setup.backends import BACKENDS, LLMBackend, load_backend
 from evalbench.utils.metrics_helper import download_nltk_data
+from evalbench.utils.metric_scheduler import DEFAULT_METRIC_CONCURRENCY, RESOURCE_CLASSES
 
 class EvalConfig:
     def __init__(
@@ -16,27 +17,172 @@ class EvalConfig:
         llm = 'llama3-8b-8192',
         output_mode='print', # print or save
         output_filepath='evaluation_results.json',
+        embedding_batch_size=256,
+        embedding_cache_dir=None,
+        embedding_cache_size=100000,
+        embedding_cache_memory_size=10000,
+        bert_model_type=None,
+        bert_num_layers=None,
+        bert_batch_size=64,
+        bert_idf=False,
+        parallel_workers=None,
+        parallel_min_batch=5000,
+        parallel_chunk_size=1000,
+        nli_batch_size=16,
+        nli_window_mode=None, # None, 'sentence' or 'token'
+        nli_window_size=400,
+        nli_window_stride=None,
+        nli_aggregation='max_entailment', # max_entailment or mean
+        nli_early_exit=0.9,
+        judge_concurrency=8,
+        async_transport=None,
+        judge_pack_size=None, # items per judge prompt; None or 1 sends one prompt per item
+        judge_fusion=True, # evaluate_module scores judges over the same inputs in one prompt
+        judge_scoring='text', # text (rating labels) or constrained (one token, expected score from logprobs)
+        judge_top_logprobs=5, # 0 for backends without logprobs
+        relevance_cascade_bands=None, # (low, high) cosine bands scored without the LLM; None disables
+        llm_cache_path=None,
+        llm_cache_ttl=None, # seconds
+        llm_cache_size=100000,
+        llm_cache_mode=None, # read_write, record or replay; defaults to EVALBENCH_LLM_CACHE_MODE or read_write
+        llm_requests_per_minute=None,
+        llm_tokens_per_minute=None,
+        llm_max_retries=5,
+        llm_retry_base_delay=1.0,
+        llm_retry_max_delay=60.0,
+        llm_backend='groq', # groq, openai (any OpenAI-compatible endpoint) or an LLMBackend
+        llm_base_url=None,
+        llm_api_key=None,
+        llm_max_connections=100,
+        llm_timeout=60.0,
+        metric_concurrency=DEFAULT_METRIC_CONCURRENCY, # threads per resource class (io, cpu, model); None runs metrics in series
+        stream_chunk_size=1000, # rows per chunk in evaluate_stream and checkpointed runs
+        checkpoint_fsync_interval=1.0, # seconds between checkpoint fsyncs
+        checkpoint_batch_size=1000, # buffered checkpoint records that force an fsync
     ):
         self.groq_api_key = groq_api_key or os.getenv('GROQ_API_KEY')
-        if not self.groq_api_key:
+        if not self.groq_api_key and llm_backend == 'groq':
             raise ValueError('GROQ API key must be provided via constructor or env variable.')
 
-        os.environ['GROQ_API_KEY'] = self.groq_api_key
+        if self.groq_api_key:
+            os.environ['GROQ_API_KEY'] = self.groq_api_key
         if download_nltk:
             download_nltk_data()
 
-        self.groq_client = Groq()
+        # heavy resources are only materialized on first use by a metric; models
+        # come from the process-wide pool so configs share identical weights
+        self.sentence_model_name = sentence_model
+        self.fact_check_model_name = fact_check_model
+        self.groq_client = LazyResource('groq_client', _load_groq_client)
+        self.async_groq_client = LazyResource('async_groq_client', _load_async_groq_client)
+        self.sentence_model = pooled_resource(
+            'sentence_model',
+            model_key('sentence_transformer', sentence_model),
+            lambda: _load_sentence_model(sentence_model),
+        )
+        self.fact_check_model = pooled_resource(
+            'fact_check_model',
+            model_key('zero_shot_pipeline', fact_check_model),
+            lambda: _load_fact_check_model(fact_check_model),
+        )
+        self.nli_scorer = pooled_resource(
+            'nli_scorer',
+            model_key('nli_classifier', fact_check_model),
+            lambda: _load_nli_scorer(fact_check_model),
+        )
+        self.nli_batch_size = nli_batch_size
 
-        # initialize once and store
-        self.sentence_model = SentenceTransformer(sentence_model)
-        self.fact_check_model = pipeline('zero-shot-classification', fact_check_model)
+        # long-context NLI: score contexts in windows instead of truncating them
+        self.nli_window_mode = nli_window_mode
+        self.nli_window_size = nli_window_size
+        self.nli_window_stride = nli_window_stride
+        self.nli_aggregation = nli_aggregation
+        self.nli_early_exit = nli_early_exit
+        self.bert_idf = bert_idf
+        bert_options = {'num_layers': bert_num_layers, 'batch_size': bert_batch_size, 'idf': bert_idf}
+        self.bert_scorer = pooled_resource(
+            'bert_scorer',
+            model_key('bert_scorer', bert_model_type or 'lang:en', **bert_options),
+            lambda: _load_bert_scorer(bert_model_type, **bert_options),
+        )
         self.llm = llm
 
+        # LLM judge and agent requests run concurrently through the backend, or
+        # through `async_transport(**request)` if given (an async callable returning a completion)
+        self.llm_backend_option = llm_backend
+        self.llm_base_url = llm_base_url
+        self.llm_api_key = llm_api_key or os.getenv('OPENAI_API_KEY')
+        self.llm_max_connections = llm_max_connections
+        self.llm_timeout = llm_timeout
+        self.llm_backend = LazyResource('llm_backend', lambda: load_backend(llm_backend, self))
+        self.judge_concurrency = judge_concurrency
+        self.async_transport = async_transport
+        self.judge_pack_size = judge_pack_size
+        self.judge_fusion = judge_fusion
+        self.judge_scoring = judge_scoring
+        self.judge_top_logprobs = judge_top_logprobs
+        self.relevance_cascade_bands = tuple(relevance_cascade_bands) if relevance_cascade_bands else None
+
+        # client-side rate limits (also updated from rate-limit response headers),
+        # adaptive concurrency capped at judge_concurrency, and jittered retries
+        self.llm_requests_per_minute = llm_requests_per_minute
+        self.llm_tokens_per_minute = llm_tokens_per_minute
+        self.llm_max_retries = llm_max_retries
+        self.llm_retry_base_delay = llm_retry_base_delay
+        self.llm_retry_max_delay = llm_retry_max_delay
+        self.rate_limiter = LazyResource(
+            'rate_limiter',
+            lambda: _load_rate_limiter(llm_requests_per_minute, llm_tokens_per_minute),
+        )
+        self.llm_concurrency = LazyResource('llm_concurrency', lambda: _load_llm_concurrency(judge_concurrency))
+
+        # persistent LLM response cache; replay mode runs judges and agents offline
+        self.llm_cache = None
+        if llm_cache_path:
+            from evalbench.utils.llm_cache import LLMResponseCache
+            self.llm_cache = LLMResponseCache(
+                llm_cache_path,
+                ttl=llm_cache_ttl,
+                max_entries=llm_cache_size,
+                mode=llm_cache_mode or os.getenv('EVALBENCH_LLM_CACHE_MODE', 'read_write'),
+            )
+
+        self.embedding_batch_size = embedding_batch_size
+        self.stream_chunk_size = stream_chunk_size
+        self.checkpoint_fsync_interval = checkpoint_fsync_interval
+        self.checkpoint_batch_size = checkpoint_batch_size
+
+        # evaluate_module runs io, cpu and model metrics side by side
+        self.metric_concurrency = (
+            {**DEFAULT_METRIC_CONCURRENCY, **metric_concurrency} if metric_concurrency is not None else None
+        )
+
+        # process pool for CPU-bound lexical metrics; None keeps them in-process
+        self.parallel_workers = parallel_workers
+        self.parallel_min_batch = parallel_min_batch
+        self.parallel_chunk_size = parallel_chunk_size
+
+        # persistent embedding cache shared by every metric that encodes text
+        self.embedding_cache = None
+        if embedding_cache_dir:
+            from evalbench.utils.embedding_cache import EmbeddingCache
+            self.embedding_cache = EmbeddingCache(
+                embedding_cache_dir,
+                sentence_model,
+                max_entries=embedding_cache_size,
+                memory_entries=embedding_cache_memory_size,
+            )
+
         self.output_mode = output_mode
         self.output_filepath = output_filepath
 
+        # hand pooled models back when the config is closed or garbage collected
+        self._finalizer = weakref.finalize(self, release_resources, self.pooled_resources())
+
     @classmethod
     def from_file(cls, file_path):
+        import yaml
+
         with open(file_path, 'r') as f:
             if file_path.endswith('.yaml') or file_path.endswith('.yml'):
                 data = yaml.safe_load(f)
@@ -47,24 +193,131 @@ class EvalConfig:
 
         return cls(**data)
 
+    # preload resources up front, e.g. for long-running services
+    def warmup(self, resources=None):
+        resources = resources or LAZY_RESOURCES
+        for name in resources:
+            if name not in LAZY_RESOURCES:
+                raise ValueError(f'Unknown resource: {name}. Expected one of {list(LAZY_RESOURCES)}')
+            getattr(self, name).resolve()
+        return self
+
+    def pooled_resources(self):
+        return [self.sentence_model, self.fact_check_model, self.nli_scorer, self.bert_scorer]
+
+    # release this config's references to pooled models
+    def close(self):
+        if self.llm_backend.loaded:
+            from evalbench.utils.llm_helper import run_sync
+            run_sync(self.llm_backend.resolve().aclose())
+        self._finalizer()
+
     # validate config
     def validate(self):
         errors = []
 
-        if not self.groq_api_key:
-            errors.append('Missing GROQ API key.')
+        backend = self.llm_backend_option
+        if isinstance(backend, str):
+            if backend not in BACKENDS:
+                errors.append(f'Invalid llm_backend: {backend}')
+            elif backend == 'groq' and not self.groq_api_key:
+                errors.append('Missing GROQ API key.')
+            elif backend == 'openai' and not self.llm_base_url:
+                errors.append('llm_base_url is required for the openai backend.')
+        elif not (isinstance(backend, LLMBackend) or callable(backend)):
+            errors.append('llm_backend must be a backend name, an LLMBackend or an async callable.')
 
         if not isinstance(self.output_mode, str) or self.output_mode not in ('print', 'save'):
             errors.append(f'Invalid output_mode: {self.output_mode}')
 
-        # check model names are strings
-        if not isinstance(self.sentence_model, SentenceTransformer):
-            errors.append('sentence_model not initialized correctly.')
-        if not callable(getattr(self.fact_check_model, '__call__', None)):
-            errors.append('fact_check_model not callable (should be a HuggingFace pipeline).')
+        # check model names are strings, without loading the models
+        if not isinstance(self.sentence_model_name, str) or not self.sentence_model_name.strip():
+            errors.append('sentence_model must be a non-empty model name.')
+        if not isinstance(self.fact_check_model_name, str) or not self.fact_check_model_name.strip():
+            errors.append('fact_check_model must be a non-empty model name.')
+        if not isinstance(self.llm, str) or not self.llm.strip():
+            errors.append('llm must be a non-empty model name.')
+        if not isinstance(self.embedding_batch_size, int) or self.embedding_batch_size <= 0:
+            errors.append('embedding_batch_size must be a positive integer.')
+        if not isinstance(self.nli_batch_size, int) or self.nli_batch_size <= 0:
+            errors.append('nli_batch_size must be a positive integer.')
+        if self.nli_window_mode not in (None, 'sentence', 'token'):
+            errors.append(f'Invalid nli_window_mode: {self.nli_window_mode}')
+        if not isinstance(self.nli_window_size, int) or self.nli_window_size <= 0:
+            errors.append('nli_window_size must be a positive integer.')
+        if self.nli_aggregation not in ('max_entailment', 'mean'):
+            errors.append(f'Invalid nli_aggregation: {self.nli_aggregation}')
+        if not isinstance(self.judge_concurrency, int) or self.judge_concurrency <= 0:
+            errors.append('judge_concurrency must be a positive integer.')
+        for name in ('llm_requests_per_minute', 'llm_tokens_per_minute'):
+            value = getattr(self, name)
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                errors.append(f'{name} must be None or a positive number.')
+        if not isinstance(self.llm_max_retries, int) or self.llm_max_retries < 0:
+            errors.append('llm_max_retries must be a non-negative integer.')
+        if self.judge_scoring not in ('text', 'constrained'):
+            errors.append(f'Invalid judge_scoring: {self.judge_scoring}')
+        if self.relevance_cascade_bands is not None:
+            bands = self.relevance_cascade_bands
+            if len(bands) != 2 or not all(isinstance(b, (int, float)) for b in bands) or bands[0] > bands[1]:
+                errors.append('relevance_cascade_bands must be a (low, high) pair with low <= high.')
+        if self.judge_pack_size is not None and (not isinstance(self.judge_pack_size, int) or self.judge_pack_size <= 0):
+            errors.append('judge_pack_size must be None or a positive integer.')
+        if self.metric_concurrency is not None:
+            for name, value in self.metric_concurrency.items():
+                if name not in RESOURCE_CLASSES:
+                    errors.append(f'Invalid metric_concurrency resource class: {name}')
+                elif not isinstance(value, int) or value <= 0:
+                    errors.append(f'metric_concurrency[{name!r}] must be a positive integer.')
+        if self.parallel_workers is not None and (not isinstance(self.parallel_workers, int) or self.parallel_workers < 0):
+            errors.append('parallel_workers must be None or a non-negative integer.')
+        if not isinstance(self.stream_chunk_size, int) or self.stream_chunk_size <= 0:
+            errors.append('stream_chunk_size must be a positive integer.')
+        if not isinstance(self.checkpoint_fsync_interval, (int, float)) or self.checkpoint_fsync_interval < 0:
+            errors.append('checkpoint_fsync_interval must be a non-negative number.')
+        if not isinstance(self.checkpoint_batch_size, int) or self.checkpoint_batch_size <= 0:
+            errors.append('checkpoint_batch_size must be a positive integer.')
+        if not isinstance(self.parallel_chunk_size, int) or self.parallel_chunk_size <= 0:
+            errors.append('parallel_chunk_size must be a positive integer.')
 
         if errors:
-            raise ValueError('Invalid configuration')
+            raise ValueError('Invalid configuration: ' + ' '.join(errors))
+
+LAZY_RESOURCES = ('sentence_model', 'fact_check_model', 'nli_scorer', 'bert_scorer', 'groq_client', 'async_groq_client')
+
+def _load_groq_client():
+    from groq import Groq
+    return Groq()
+
+def _load_async_groq_client():
+    from groq import AsyncGroq
+    # retries are handled by llm_helper, together with the rate limiter
+    return AsyncGroq(max_retries=0)
+
+def _load_rate_limiter(requests_per_minute, tokens_per_minute):
+    from evalbench.utils.rate_limit import RateLimiter
+    return RateLimiter(requests_per_minute, tokens_per_minute)
+
+def _load_llm_concurrency(maximum):
+    from evalbench.utils.rate_limit import AdaptiveConcurrency
+    return AdaptiveConcurrency(maximum)
+
+def _load_sentence_model(model_name):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+def _load_fact_check_model(model_name):
+    from transformers import pipeline
+    return pipeline('zero-shot-classification', model_name)
+
+def _load_nli_scorer(model_name):
+    from evalbench.utils.nli_helper import NLIScorer
+    return NLIScorer(model_name)
+
+def _load_bert_scorer(model_type=None, num_layers=None, batch_size=64, idf=False):
+    from bert_score import BERTScorer
+    # lang is only used to pick the default model when model_type is not given
+    return BERTScorer(model_type=model_type, num_layers=num_layers, batch_size=batch_size, idf=idf, lang='en')
 
 def load_config(filepath):
     return EvalConfig.from_file(filepath)
\ No newline at end of file
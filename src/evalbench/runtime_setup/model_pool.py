@@ -0,0 +1,142 @@
+import os
+import threading
+from collections import OrderedDict
+from evalbench.runtime_setup.resources import LazyResource
+
+class _PoolEntry:
+    def __init__(self, model, size_bytes):
+        self.model = model
+        self.size_bytes = size_bytes
+        self.refcount = 0
+
+# Process-wide pool of loaded models keyed by (kind, model name, options).
+# Configs asking for the same model share one instance. Entries are reference
+# counted, and idle ones (refcount 0) are evicted least-recently-used first once
+# the pool exceeds its memory budget.
+class ModelPool:
+    def __init__(self, max_memory_mb=None):
+        self.max_memory_mb = max_memory_mb
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def acquire(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return self._checkout(key, entry)
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        # load outside the pool lock so different models can load concurrently
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return self._checkout(key, entry)
+
+            model = loader()
+            entry = _PoolEntry(model, estimate_model_bytes(model))
+
+            with self._lock:
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self.loads += 1
+                model = self._checkout(key, entry, hit=False)
+                self._evict()
+                return model
+
+    def release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount = max(entry.refcount - 1, 0)
+            self._evict()
+
+    def resize(self, max_memory_mb):
+        with self._lock:
+            self.max_memory_mb = max_memory_mb
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refcount == 0]:
+                del self._entries[key]
+
+    def memory_bytes(self):
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'models': len(self._entries),
+                'in_use': sum(1 for e in self._entries.values() if e.refcount > 0),
+                'memory_mb': round(self.memory_bytes() / 2**20, 1),
+                'max_memory_mb': self.max_memory_mb,
+                'hits': self.hits,
+                'loads': self.loads,
+                'evictions': self.evictions,
+            }
+
+    def _checkout(self, key, entry, hit=True):
+        entry.refcount += 1
+        self._entries.move_to_end(key)
+        if hit:
+            self.hits += 1
+        return entry.model
+
+    def _evict(self):
+        if self.max_memory_mb is None:
+            return
+
+        budget = self.max_memory_mb * 2**20
+        for key in list(self._entries):
+            if self.memory_bytes() <= budget:
+                break
+            if self._entries[key].refcount == 0:
+                del self._entries[key]
+                self.evictions += 1
+
+def estimate_model_bytes(model):
+    # torch modules (SentenceTransformer), HF pipelines (.model) and BERTScorer (._model)
+    for candidate in (model, getattr(model, 'model', None), getattr(model, '_model', None)):
+        parameters = getattr(candidate, 'parameters', None)
+        if callable(parameters):
+            try:
+                size = sum(p.numel() * p.element_size() for p in candidate.parameters())
+                size += sum(b.numel() * b.element_size() for b in candidate.buffers())
+                return size
+            except Exception:
+                continue
+    return 0
+
+def model_key(kind, name, **options):
+    return kind, name, tuple(sorted(options.items()))
+
+def _budget_from_env():
+    value = os.getenv('EVALBENCH_MODEL_POOL_MB')
+    return float(value) if value else None
+
+_pool = ModelPool(max_memory_mb=_budget_from_env())
+
+def get_model_pool():
+    return _pool
+
+def configure_model_pool(max_memory_mb=None):
+    _pool.resize(max_memory_mb)
+    return _pool
+
+# lazy handle whose model comes from (and is returned to) the shared pool
+def pooled_resource(name, key, loader):
+    return LazyResource(
+        name,
+        lambda: get_model_pool().acquire(key, loader),
+        releaser=lambda: get_model_pool().release(key),
+    )
+
+def release_resources(resources):
+    for resource in resources:
+        resource.release()
@@ -0,0 +1,54 @@
+import threading
+
+_HANDLE_ATTRS = ('_name', '_loader', '_releaser', '_value', '_loaded', '_lock')
+
+# Handle to a heavy resource (model, pipeline, client) that is only built the
+# first time a metric touches it. Attribute access and calls are forwarded to
+# the underlying object, so `cfg.sentence_model.encode(...)` keeps working.
+class LazyResource:
+    def __init__(self, name, loader, releaser=None):
+        self._name = name
+        self._loader = loader
+        self._releaser = releaser
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def resolve(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._value = self._loader()
+                    self._loaded = True
+        return self._value
+
+    # drop the handle's reference; the next use loads (or re-acquires) it again
+    def release(self):
+        with self._lock:
+            if not self._loaded:
+                return
+            self._value = None
+            self._loaded = False
+            if self._releaser is not None:
+                self._releaser()
+
+    def __getattr__(self, item):
+        # only reached for attributes not defined on the handle itself
+        if item.startswith('__') and item.endswith('__') or item in _HANDLE_ATTRS:
+            raise AttributeError(item)
+        return getattr(self.resolve(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        state = 'loaded' if self._loaded else 'not loaded'
+        return f'<LazyResource {self._name} ({state})>'
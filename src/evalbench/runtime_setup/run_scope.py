@@ -0,0 +1,52 @@
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# State shared by every metric evaluated within one run (e.g. one evaluate_module
+# call). Metrics keep their per-run caches here so work done by one metric can be
+# reused by the next one over the same inputs.
+class RunState:
+    def __init__(self):
+        self.caches = {}
+        # metrics scheduled on different threads share the run
+        self._lock = threading.RLock()
+
+    def cache(self, name, factory):
+        with self._lock:
+            if name not in self.caches:
+                self.caches[name] = factory()
+            return self.caches[name]
+
+    def stats(self):
+        return {
+            name: cache.stats()
+            for name, cache in self.caches.items()
+            if callable(getattr(cache, 'stats', None))
+        }
+
+_active_run = contextvars.ContextVar('evalbench_active_run', default=None)
+
+@contextmanager
+def run_scope():
+    state = _active_run.get()
+    if state is not None:
+        # nested scopes share the outer run
+        yield state
+        return
+
+    state = RunState()
+    token = _active_run.set(state)
+    try:
+        yield state
+    finally:
+        _active_run.reset(token)
+
+def get_active_run():
+    return _active_run.get()
+
+# per-run cache if a run is active, otherwise a fresh one for this call only
+def get_run_cache(name, factory):
+    state = _active_run.get()
+    if state is None:
+        return factory()
+    return state.cache(name, factory)
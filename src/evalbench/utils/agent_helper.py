@@ -2,11 +2,10 @@ import json
 import time
 from collections import defaultdict
 import evalbench
-from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.llm_helper import complete
+from evalbench.utils.rate_limit import backoff_delay
 
 def plan_steps(instruction):
-    cfg = get_config()
-
     def call():
         prompt = f'''
         You are a planning assistant for an LLM evaluation library called EvalBench.
@@ -29,18 +28,11 @@ def plan_steps(instruction):
         \'\'\'{instruction}\'\'\'
         '''
 
-        response = cfg.groq_client.chat.completions.create(
-            model=cfg.llm,
-            messages=[{'role': 'user', 'content': prompt}],
-            temperature=0,
-        )
-        return response.choices[0].message.content.strip()
+        return complete(prompt, temperature=0).strip()
 
     return retry_with_backoff(call)
 
 def get_task(instruction, data):
-    cfg = get_config()
-
     def call():
         prompt = f'''
         You are a task identification assistant.
@@ -92,12 +84,7 @@ def get_task(instruction, data):
         \'\'\'{data if data else 'N/A'}\'\'\'
         '''
 
-        response = cfg.groq_client.chat.completions.create(
-            model=cfg.llm,
-            messages=[{'role': 'user', 'content': prompt}],
-            temperature=1,
-        )
-        return response.choices[0].message.content.strip()
+        return complete(prompt, temperature=1).strip()
 
     return retry_with_backoff(call)
 
@@ -174,8 +161,6 @@ def prepare_metric_inputs(validated_metrics, data):
     return metric_inputs_map
 
 def improve_prompt(instruction):
-    cfg = get_config()
-
     try:
         prompt = f'''
         You are a prompt improvement assistant for an evaluation library called EvalBench.
@@ -200,25 +185,19 @@ def improve_prompt(instruction):
         \'\'\'{instruction}\'\'\'
         '''
 
-        response = cfg.groq_client.chat.completions.create(
-            model=cfg.llm,
-            messages=[{'role': 'user', 'content': prompt}],
-            temperature=0.5,
-        )
-
-        improved_instruction = response.choices[0].message.content.strip()
+        improved_instruction = complete(prompt, temperature=0.5).strip()
     except Exception as e:
         improved_instruction = 'Sorry, unable to provide instruction improvements at this time. Please try rephrasing your request.'
 
     return improved_instruction
 
+# retries the agent step itself, e.g. on unparseable output; API errors are
+# already retried per request in llm_helper
 def retry_with_backoff(func, max_retries=3, initial_delay=1, *args, **kwargs):
-    delay = initial_delay
     for attempt in range(max_retries):
         try:
             return func(*args, **kwargs)
         except Exception as e:
             if attempt < max_retries - 1:
-                time.sleep(delay)
-                delay = 2
+                time.sleep(backoff_delay(attempt, initial_delay))
     return None
\ No newline at end of file
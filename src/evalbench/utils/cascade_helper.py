@@ -0,0 +1,107 @@
+import numpy as np
+from typing import List, Dict
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.runtime_setup.run_scope import get_run_cache
+from evalbench.utils.embedding_helper import encode_texts, rowwise_cosine
+from evalbench.utils.judge_helper import JudgeRubric, format_scores, score_items
+
+# Embedding pre-filter for relevance judges: pairs whose cosine similarity is
+# below the low band are scored as the lowest rating, pairs at or above the high
+# band as the highest, and only the uncertain middle goes to the LLM judge.
+class CascadeStats:
+    def __init__(self):
+        self.pairs = 0
+        self.scored_low = 0
+        self.scored_high = 0
+
+    @property
+    def judged(self):
+        return self.pairs - self.scored_low - self.scored_high
+
+    @property
+    def avoided_share(self):
+        return (self.scored_low + self.scored_high) / self.pairs if self.pairs else 0.0
+
+    def add(self, pairs, low, high):
+        self.pairs += pairs
+        self.scored_low += low
+        self.scored_high += high
+
+    def stats(self):
+        return {
+            'pairs': self.pairs,
+            'scored_low': self.scored_low,
+            'scored_high': self.scored_high,
+            'judged': self.judged,
+            'avoided_share': round(self.avoided_share, 4),
+        }
+
+_totals = CascadeStats()
+
+# process-wide share of relevance judge calls answered by the embedding pre-filter
+def get_cascade_stats():
+    return _totals.stats()
+
+def _as_text(value):
+    return ' '.join(map(str, value)) if isinstance(value, (list, tuple)) else str(value)
+
+def cascade_score_items(rubric: JudgeRubric, items: List[Dict[str, str]], query_field: str, text_field: str) -> List[str]:
+    bands = get_config().relevance_cascade_bands
+    if not bands:
+        return score_items(rubric, items)
+
+    low, high = bands
+    similarity = rowwise_cosine(
+        encode_texts([_as_text(item[query_field]) for item in items]),
+        encode_texts([_as_text(item[text_field]) for item in items]),
+    )
+    lowest, highest = float(min(rubric.scores)), float(max(rubric.scores))
+    direct = {
+        idx: lowest if value < low else highest
+        for idx, value in enumerate(similarity)
+        if value < low or value >= high
+    }
+    pending = [idx for idx in range(len(items)) if idx not in direct]
+
+    results = [None] * len(items)
+    if get_config().judge_scoring == 'constrained':
+        labels = list(direct.values())
+    else:
+        labels = format_scores([str(score) for score in direct.values()], rubric.scale)
+    for idx, label in zip(direct, labels):
+        results[idx] = label
+    if pending:
+        for idx, label in zip(pending, score_items(rubric, [items[idx] for idx in pending])):
+            results[idx] = label
+
+    scored_low = sum(1 for score in direct.values() if score == lowest)
+    for stats in (_totals, get_run_cache('cascade', CascadeStats)):
+        stats.add(len(items), scored_low, len(direct) - scored_low)
+    return results
+
+# Pick cosine bands from a labelled sample (e.g. a run with the cascade off):
+# `low` is the largest threshold below which at least `precision` of pairs got
+# the lowest score, `high` the smallest threshold at or above which at least
+# `precision` got the highest. Returns (low, high) for relevance_cascade_bands.
+def calibrate_bands(similarities, scores, lowest, highest, precision=0.95, min_support=20):
+    similarities = np.asarray(similarities, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    order = np.argsort(similarities)
+    sims, labels = similarities[order], scores[order]
+    count = np.arange(1, len(sims) + 1)
+
+    low = float(sims.min()) if len(sims) else 0.0
+    hits_low = np.cumsum(labels == lowest) / count
+    confident = np.nonzero((hits_low >= precision) & (count >= min_support))[0]
+    if len(confident):
+        # the band is half-open: similarity < low
+        last = confident[-1]
+        low = float(sims[last + 1]) if last + 1 < len(sims) else float(np.nextafter(sims[last], np.inf))
+
+    high = float('inf')
+    hits_high = np.cumsum((labels == highest)[::-1]) / count
+    confident = np.nonzero((hits_high >= precision) & (count >= min_support))[0]
+    if len(confident):
+        high = float(sims[::-1][confident[-1]])
+
+    return low, max(low, high)
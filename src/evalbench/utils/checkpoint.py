@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from evalbench.error_handling.custom_error import Error, ErrorMessages
+
+MISSING = object()
+
+def _row_key(row):
+    return row if isinstance(row, (int, str)) else json.dumps(row, sort_keys=True)
+
+# short stable hash of JSON-like inputs, to tell whether a checkpoint belongs to them
+def fingerprint(value):
+    data = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+# Append-only JSONL record of finished (row id, metric) results, so an
+# interrupted evaluation can resume without recomputing them (or paying for
+# their LLM calls again). Lines are buffered and written with one fsync per
+# `batch_size` records or `fsync_interval` seconds, whichever comes first; a
+# crash loses at most that window, which is simply recomputed on resume.
+#   {"row": 12, "metric": "bleu_score", "output": 0.41, "input": "<row fingerprint>"}
+#   {"meta": "agent_metrics", "value": [...]}
+# With resume=False an existing checkpoint at `path` is started over. Results
+# recorded with an input fingerprint are only reused for the same inputs.
+# Outputs are not kept in memory once written: only the byte offset of each
+# record is, and `get` reads a replayed output back from the file.
+class RunCheckpoint:
+    def __init__(self, path, resume=False, fsync_interval=1.0, batch_size=1000):
+        self.path = os.fspath(path)
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        # (row, metric) -> offset of its record line, None while still buffered
+        self.offsets = {}
+        self.digests = {}
+        self.meta = {}
+        self.restored = 0
+        self.recorded = 0
+        self.syncs = 0
+        self._buffer = []
+        # outputs of buffered records, dropped once they are written
+        self._pending = {}
+        self._size = 0
+        self._reader = None
+        self._lock = threading.Lock()
+        self._last_sync = time.monotonic()
+
+        if resume and os.path.exists(self.path):
+            self._load()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # no newline translation, so the tracked offsets match the bytes on disk
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8', newline='')
+
+    def _load(self):
+        complete = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # a torn final line from a crash mid-write
+                    break
+                offset = complete
+                complete += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'meta' in record:
+                    self.meta[record['meta']] = record['value']
+                elif 'metric' in record:
+                    key = (_row_key(record['row']), record['metric'])
+                    self.offsets[key] = offset
+                    if 'input' in record:
+                        self.digests[key] = record['input']
+        self.restored = len(self.offsets)
+        self._size = complete
+
+        # cut the torn fragment off so appended records start on a fresh line
+        if complete < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete)
+
+    def get(self, row, metric, default=MISSING, digest=None):
+        key = (_row_key(row), metric)
+        if digest is not None and key in self.digests and self.digests[key] != digest:
+            raise Error(ErrorMessages.CHECKPOINT_MISMATCH, path=self.path, what=f'inputs at row {row!r}')
+        with self._lock:
+            if key not in self.offsets:
+                return default
+            if key in self._pending:
+                return self._pending[key]
+            return self._read(self.offsets[key])['output']
+
+    def _read(self, offset):
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())
+
+    def done(self, row, metric):
+        return (_row_key(row), metric) in self.offsets
+
+    def record(self, row, metric, output, digest=None):
+        record = {'row': row, 'metric': metric, 'output': output}
+        if digest is not None:
+            record['input'] = digest
+        key = (_row_key(row), metric)
+        with self._lock:
+            self.offsets[key] = None
+            self._pending[key] = output
+            if digest is not None:
+                self.digests[key] = digest
+            self._buffer.append((key, json.dumps(record) + '\n'))
+            self.recorded += 1
+            self._maybe_sync()
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self.meta[key] = value
+            self._buffer.append((None, json.dumps({'meta': key, 'value': value}) + '\n'))
+            self._sync()
+
+    # store `value` under `key`, or check it against the value of a resumed run
+    def check_meta(self, key, value):
+        if key not in self.meta:
+            self.set_meta(key, value)
+        elif self.meta[key] != value:
+            raise Error(ErrorMessages.CHECKPOINT_MISMATCH, path=self.path, what=key.replace('_', ' '))
+
+    def flush(self, force=False):
+        with self._lock:
+            self._sync() if force else self._maybe_sync()
+
+    def _maybe_sync(self):
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+
+    def _sync(self):
+        self._last_sync = time.monotonic()
+        if not self._buffer:
+            return
+        for key, line in self._buffer:
+            if key is not None:
+                self.offsets[key] = self._size
+                self._pending.pop(key, None)
+            self._size += len(line.encode('utf-8'))
+        self._file.writelines(line for _, line in self._buffer)
+        self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+
+    def close(self):
+        if not self._file.closed:
+            self.flush(force=True)
+            self._file.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self):
+        return {'restored': self.restored, 'recorded': self.recorded, 'syncs': self.syncs}
+
+# RunCheckpoint for a path (configured from the active config), closed on exit;
+# a RunCheckpoint passed in is only flushed, its owner closes it
+@contextmanager
+def checkpoint_scope(checkpoint, resume=False):
+    if isinstance(checkpoint, RunCheckpoint):
+        try:
+            yield checkpoint
+        finally:
+            checkpoint.flush(force=True)
+        return
+
+    from evalbench.runtime_setup.runtime import get_config
+
+    cfg = get_config()
+    with RunCheckpoint(
+        checkpoint,
+        resume=resume,
+        fsync_interval=cfg.checkpoint_fsync_interval,
+        batch_size=cfg.checkpoint_batch_size,
+    ) as opened:
+        yield opened
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+from collections import OrderedDict
+
+# Content-addressed embedding cache. Vectors live in a fixed-capacity memory-mapped
+# float32 array on disk with a JSON index (key -> row), keyed by the model name plus
+# a hash of the text. A small in-memory LRU tier sits in front of it. When the disk
+# store is full the least recently used row is overwritten.
+class EmbeddingCache:
+    INDEX_FILE = 'index.json'
+    VECTORS_FILE = 'vectors.f32'
+
+    def __init__(self, directory, model_name, max_entries=100000, memory_entries=10000):
+        self.model_name = model_name
+        self.directory = os.path.join(directory, hashlib.sha1(model_name.encode('utf-8')).hexdigest()[:16])
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._memory = OrderedDict()
+        self._slots = None  # key -> row, least recently used first
+        self._vectors = None
+        self._dim = None
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text):
+        return hashlib.sha256(f'{self.model_name}\x00{text}'.encode('utf-8')).hexdigest()
+
+    # returns {text: vector} for the texts that are cached
+    def get_many(self, texts):
+        found = {}
+        with self._lock:
+            self._open()
+            for text in texts:
+                key = self.key(text)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    if key in self._slots:
+                        self._slots.move_to_end(key)
+                    found[text] = self._memory[key]
+                    self.memory_hits += 1
+                elif key in self._slots:
+                    self._slots.move_to_end(key)
+                    vector = np.array(self._vectors[self._slots[key]])
+                    self._remember(key, vector)
+                    found[text] = vector
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+        return found
+
+    def put_many(self, texts, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            self._open()
+            if self._vectors is None:
+                self._create(vectors.shape[1])
+
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                if key in self._slots:
+                    row = self._slots.pop(key)
+                elif len(self._slots) < self.max_entries:
+                    row = len(self._slots)
+                else:
+                    _, row = self._slots.popitem(last=False)
+                    self.evictions += 1
+                self._slots[key] = row
+                self._vectors[row] = vector
+                self._remember(key, vector)
+
+            self._flush()
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._slots or {}),
+            'memory_entries': len(self._memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._slots = OrderedDict()
+            self._vectors = None
+            self._dim = None
+            for name in (self.INDEX_FILE, self.VECTORS_FILE):
+                path = os.path.join(self.directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _open(self):
+        if self._slots is not None:
+            return
+
+        self._slots = OrderedDict()
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+
+        self._dim = index['dim']
+        capacity = index['capacity']
+        stored = np.memmap(os.path.join(self.directory, self.VECTORS_FILE), dtype=np.float32, mode='r+',
+                           shape=(capacity, self._dim))
+        entries = index['entries']
+
+        if capacity == self.max_entries:
+            self._vectors = stored
+            self._slots = OrderedDict((key, row) for key, row in entries)
+            return
+
+        # capacity changed: keep the most recently used rows in a resized store
+        kept = entries[-self.max_entries:]
+        rows = np.array([stored[row] for _, row in kept], dtype=np.float32)
+        del stored
+        self._create(self._dim)
+        for new_row, (key, _) in enumerate(kept):
+            self._vectors[new_row] = rows[new_row]
+            self._slots[key] = new_row
+        self._flush()
+
+    def _create(self, dim):
+        os.makedirs(self.directory, exist_ok=True)
+        self._dim = int(dim)
+        self._vectors = np.memmap(os.path.join(self.directory, self.VECTORS_FILE), dtype=np.float32, mode='w+',
+                                  shape=(self.max_entries, self._dim))
+
+    def _flush(self):
+        self._vectors.flush()
+        index = {
+            'model': self.model_name,
+            'dim': self._dim,
+            'capacity': self.max_entries,
+            'entries': list(self._slots.items()),
+        }
+        tmp_path = os.path.join(self.directory, self.INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, os.path.join(self.directory, self.INDEX_FILE))
@@ -0,0 +1,34 @@
+import numpy as np
+from typing import List
+from evalbench.runtime_setup.runtime import get_config
+
+# Encode texts with the configured sentence model. Each distinct string is
+# encoded once, in batches, and the rows are mapped back to the input order.
+# Strings already in the config's embedding cache are not re-encoded.
+def encode_texts(texts: List[str], batch_size: int = None) -> np.ndarray:
+    cfg = get_config()
+    batch_size = batch_size or cfg.embedding_batch_size
+    cache = cfg.embedding_cache
+
+    unique_texts = list(dict.fromkeys(texts))
+    cached = cache.get_many(unique_texts) if cache is not None else {}
+    missing = [text for text in unique_texts if text not in cached]
+
+    if missing:
+        encoded = cfg.sentence_model.encode(
+            missing,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        if cache is not None:
+            cache.put_many(missing, encoded)
+        cached.update(zip(missing, encoded))
+
+    return np.stack([cached[text] for text in texts]).astype(np.float32, copy=False)
+
+# cosine similarity of each row of `a` with the same row of `b`
+def rowwise_cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    return np.einsum('ij,ij->i', a, b) / np.maximum(norms, 1e-12)
@@ -0,0 +1,277 @@
+import re
+import json
+import math
+import inspect
+import warnings
+from typing import List, Dict
+from evalbench.error_handling.custom_error import Error
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.runtime_setup.run_scope import get_run_cache
+from evalbench.utils.llm_helper import complete_many, create_many
+from evalbench.utils.rate_limit import is_retryable, status_code
+
+_JSON_ARRAY = re.compile(r'\[.*?\]', re.DOTALL)
+_JSON_OBJECT = re.compile(r'\{.*?\}', re.DOTALL)
+
+# An LLM-judge rubric: shared instructions (scale, guidelines, few-shot examples)
+# plus a template for one item. Single prompts and packed multi-item prompts are
+# both built from it, so the instructions are written once per rubric.
+class JudgeRubric:
+    # `cascaded` rubrics go through the embedding pre-filter (cascade_helper) when
+    # relevance_cascade_bands is set, so they are kept out of fused prompts then
+    def __init__(self, name, scale, instructions, item_template, lead_in='Now evaluate:', answer_prefix='Rating:',
+                 cascaded=False):
+        self.name = name
+        self.scale = scale
+        self.instructions = inspect.cleandoc(instructions)
+        self.item_template = inspect.cleandoc(item_template)
+        self.lead_in = lead_in
+        self.answer_prefix = answer_prefix
+        self.cascaded = cascaded
+
+    @property
+    def scores(self):
+        return [member.score for member in self.scale]
+
+    def item(self, item: Dict[str, str]) -> str:
+        return self.item_template.format(**item)
+
+    def prompt(self, item: Dict[str, str]) -> str:
+        return f'{self.instructions}\n\n{self.lead_in}\n{self.item(item)}\n\n{self.answer_prefix}'
+
+    def packed_prompt(self, items: List[Dict[str, str]]) -> str:
+        blocks = '\n\n'.join(f'Item {idx}:\n{self.item(item)}' for idx, item in enumerate(items, start=1))
+        return (
+            f'{self.instructions}\n\n'
+            f'Now evaluate each of the following {len(items)} items independently, using the same scale.\n\n'
+            f'{blocks}\n\n'
+            f'Respond ONLY with a JSON array of {len(items)} numbers, one rating per item in the order given, '
+            f'e.g. {json.dumps(self.scores[:1] * len(items))}. No extra text.'
+        )
+
+# a bare rating, optionally prefixed ('Rating: 3', 'Score = 4') or out of a scale ('3/5')
+_SCORE = re.compile(r'^\s*(?:[a-z ]*(?:rating|score)\s*[:=]?)?\s*(-?\d+(?:\.\d+)?)\s*(?:/\s*\d+)?\s*\.?\s*$', re.IGNORECASE)
+
+def parse_score(content):
+    match = _SCORE.match(str(content)) if content is not None else None
+    return float(match.group(1)) if match else None
+
+# Score labels for judge outputs: '<score> - <description>' for scores on the
+# rubric scale, 'Invalid score' otherwise, so results stay aligned with inputs.
+def format_scores(contents: List[str], scale) -> List[str]:
+    results = []
+    for content in contents:
+        score = parse_score(content)
+        label = scale.from_score(score) if score is not None else None
+        results.append(f'{score} - {label.description}' if label else 'Invalid score')
+    return results
+
+# Expected rating under the judge's next-token distribution over the rubric
+# scores, from top logprobs. Without logprobs it is the sampled rating itself;
+# None if neither is on the scale.
+def expected_score(completion, scale):
+    valid = {float(member.score) for member in scale}
+    choice = completion.choices[0]
+    content = getattr(getattr(choice, 'logprobs', None), 'content', None)
+    if content:
+        weights = {}
+        for candidate in getattr(content[0], 'top_logprobs', None) or [content[0]]:
+            score = parse_score(candidate.token)
+            if score in valid:
+                weights[score] = weights.get(score, 0.0) + math.exp(candidate.logprob)
+        if weights:
+            total = sum(weights.values())
+            return sum(score * weight for score, weight in weights.items()) / total
+
+    score = parse_score(choice.message.content)
+    return score if score in valid else None
+
+# one-token judging: continuous expected scores (rounded to 2 places), None for unreadable items
+def constrained_scores(rubric: JudgeRubric, items: List[Dict[str, str]]) -> List[float]:
+    cfg = get_config()
+    params = {'max_tokens': 1}
+    if cfg.judge_top_logprobs:
+        params.update(logprobs=True, top_logprobs=cfg.judge_top_logprobs)
+
+    completions = create_many([rubric.prompt(item) for item in items], temperature=0, **params)
+    scores = [expected_score(completion, rubric.scale) for completion in completions]
+    return [None if score is None else round(score, 2) for score in scores]
+
+# send one judge prompt per item, concurrently, and label the scores
+def score_prompts(prompts: List[str], scale) -> List[str]:
+    return format_scores(complete_many(prompts, temperature=0), scale)
+
+# Parse a packed judge reply into one score per item; None marks items whose
+# score is missing or off the scale. A reply of the wrong length fails entirely.
+def parse_packed_scores(content: str, count: int, scale) -> List[float]:
+    match = _JSON_ARRAY.search(content or '')
+    try:
+        values = json.loads(match.group(0)) if match else None
+    except json.JSONDecodeError:
+        values = None
+    if not isinstance(values, list) or len(values) != count:
+        return [None] * count
+
+    scores = []
+    for value in values:
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            score = None
+        scores.append(score if score is not None and scale.from_score(score) else None)
+    return scores
+
+def _judge_contents(rubric: JudgeRubric, items: List[Dict[str, str]]) -> List[str]:
+    pack_size = get_config().judge_pack_size
+    if not pack_size or pack_size <= 1 or len(items) <= 1:
+        return complete_many([rubric.prompt(item) for item in items], temperature=0)
+
+    # N items per prompt; only items whose score cannot be read fall back to single prompts
+    groups = [items[i:i + pack_size] for i in range(0, len(items), pack_size)]
+    replies = complete_many([rubric.packed_prompt(group) for group in groups], temperature=0)
+
+    contents = []
+    for group, reply in zip(groups, replies):
+        contents.extend(None if score is None else str(score) for score in parse_packed_scores(reply, len(group), rubric.scale))
+
+    failed = [idx for idx, content in enumerate(contents) if content is None]
+    if failed:
+        fallback = complete_many([rubric.prompt(items[idx]) for idx in failed], temperature=0)
+        for idx, content in zip(failed, fallback):
+            contents[idx] = content
+    return contents
+
+def score_items(rubric: JudgeRubric, items: List[Dict[str, str]]) -> List[str]:
+    if get_config().judge_scoring == 'constrained':
+        return constrained_scores(rubric, items)
+
+    # scores already produced by a fused multi-criteria call in this run
+    fused = get_run_cache('judge_scores', FusedScores)
+    contents = [fused.take(rubric, item) for item in items]
+
+    pending = [idx for idx, content in enumerate(contents) if content is None]
+    if pending:
+        for idx, content in zip(pending, _judge_contents(rubric, [items[idx] for idx in pending])):
+            contents[idx] = content
+
+    return format_scores(contents, rubric.scale)
+
+def _item_key(item):
+    return json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+
+# Per-run store of criterion scores from fused judge calls, consumed by score_items.
+class FusedScores:
+    def __init__(self):
+        self.scores = {}
+        self.calls = 0
+        self.hits = 0
+        self.failures = 0
+
+    def put(self, rubric, item, score):
+        self.scores[(rubric.name, _item_key(item))] = str(score)
+
+    def take(self, rubric, item):
+        content = self.scores.get((rubric.name, _item_key(item)))
+        if content is not None:
+            self.hits += 1
+        return content
+
+    def stats(self):
+        return {'fused_calls': self.calls, 'scores': len(self.scores), 'hits': self.hits, 'failures': self.failures}
+
+# output-format directions in rubric text ("Respond with only the number.",
+# "- Return only the number—no extra explanation."), which contradict a JSON reply
+_FORMAT_HINT = re.compile(r'\b(?:only|single number|no extra|do not include)\b', re.I)
+_FORMAT_TOPIC = re.compile(r'\b(?:number|explanations?|text|comments)\b', re.I)
+_FORMAT_SENTENCE = re.compile(r'\s*\b(?:Respond|Return|Output|Reply)\b[^.\n]*\bonly\b[^.\n]*\.', re.I)
+
+def criterion_instructions(rubric: JudgeRubric) -> str:
+    lines = []
+    for line in rubric.instructions.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('-') and _FORMAT_HINT.search(stripped) and _FORMAT_TOPIC.search(stripped):
+            continue
+        lines.append(_FORMAT_SENTENCE.sub('', line))
+    return '\n'.join(lines)
+
+def fused_prompt(rubrics: List[JudgeRubric], item: Dict[str, str]) -> str:
+    criteria = '\n\n'.join(f'Criterion "{rubric.name}":\n{criterion_instructions(rubric)}' for rubric in rubrics)
+    example = json.dumps({rubric.name: rubric.scores[-1] for rubric in rubrics})
+    return (
+        f'You are a helpful and fair evaluator. Rate the item below on each of the following '
+        f'{len(rubrics)} criteria independently, each on its own scale.\n\n'
+        f'{criteria}\n\n'
+        f'Now evaluate:\n{rubrics[0].item(item)}\n\n'
+        f'Respond ONLY with a JSON object mapping each criterion name to its numeric rating, e.g. {example}. No extra text.'
+    )
+
+# criterion name -> score, None for criteria missing from the reply or off their scale
+def parse_fused_scores(content: str, rubrics: List[JudgeRubric]) -> Dict[str, float]:
+    match = _JSON_OBJECT.search(content or '')
+    try:
+        values = json.loads(match.group(0)) if match else None
+    except json.JSONDecodeError:
+        values = None
+    if not isinstance(values, dict):
+        values = {}
+
+    scores = {}
+    for rubric in rubrics:
+        try:
+            score = float(values.get(rubric.name))
+        except (TypeError, ValueError):
+            score = None
+        scores[rubric.name] = score if score is not None and rubric.scale.from_score(score) else None
+    return scores
+
+# errors of the LLM call itself: API statuses (auth, bad request, throttling),
+# transport failures and replay-mode cache misses; anything else is a bug
+def _llm_error(exc):
+    if isinstance(exc, Error) or status_code(exc) is not None or is_retryable(exc):
+        return True
+    # SDK and httpx errors, matched by name so no client library is imported
+    names = [cls.__name__ for cls in type(exc).__mro__]
+    return any(name in ('APIError', 'GroqError', 'OpenAIError', 'HTTPError') for name in names)
+
+# Judge metrics over the same inputs are scored together: one prompt per item
+# returning a score per criterion. Results are stored in the active run for the
+# metrics' own score_items calls; criteria that fail to parse, and groups whose
+# LLM calls fail, are left for them. Only programming errors propagate.
+def prefetch_fused_scores(metrics: List[dict], inputs: Dict[str, list]):
+    if get_config().judge_scoring == 'constrained':
+        # one-token replies cannot carry several criteria
+        return
+
+    cascade = bool(get_config().relevance_cascade_bands)
+    groups = {}
+    for metric in metrics:
+        rubric = metric.get('rubric')
+        # fusing would send cascaded items to the LLM before the pre-filter could skip them
+        if rubric is not None and not (cascade and rubric.cascaded):
+            groups.setdefault(tuple(metric['required_args']), []).append(metric['rubric'])
+
+    fused = get_run_cache('judge_scores', FusedScores)
+    for args, rubrics in groups.items():
+        columns = [inputs.get(arg) for arg in args]
+        # malformed inputs are left to each metric's own validation
+        if len(rubrics) < 2 or not all(isinstance(col, list) and col for col in columns):
+            continue
+        if len({len(col) for col in columns}) != 1:
+            continue
+
+        items = [dict(zip(args, values)) for values in zip(*columns)]
+        try:
+            replies = complete_many([fused_prompt(rubrics, item) for item in items], temperature=0)
+        except Exception as e:
+            if not _llm_error(e):
+                raise
+            fused.failures += 1
+            names = ', '.join(rubric.name for rubric in rubrics)
+            warnings.warn(f'Fused judge call for {names} failed ({e!r}); each metric scores on its own.')
+            continue
+        fused.calls += len(items)
+        for item, reply in zip(items, replies):
+            scores = parse_fused_scores(reply, rubrics)
+            for rubric in rubrics:
+                if scores[rubric.name] is not None:
+                    fused.put(rubric, item, scores[rubric.name])
@@ -0,0 +1,72 @@
+from typing import List, Tuple, Dict
+from evalbench.utils.tokenization import TokenCache, get_token_cache
+
+# Scoring kernels for the CPU-bound lexical metrics. They take a chunk of
+# (reference, generated) rows and return one score per row, and are safe to run
+# either in-process or inside a worker of the lexical process pool.
+
+ROUGE_TYPES = ['rouge1', 'rouge2', 'rougeL']
+
+# set in pool workers by init_worker(); None when running in-process
+_worker = None
+
+class _WorkerState:
+    def __init__(self):
+        from rouge_score import rouge_scorer
+
+        self.tokens = TokenCache()
+        self.rouge = rouge_scorer.RougeScorer(ROUGE_TYPES, tokenizer=_ChunkTokenizer(self))
+
+class _ChunkTokenizer:
+    def __init__(self, state):
+        self.state = state
+
+    def tokenize(self, text):
+        return self.state.tokens.stems(text)
+
+# load NLTK data and build scorers once per worker process
+def init_worker():
+    global _worker
+    from nltk.corpus import wordnet
+    from nltk.tokenize import word_tokenize
+
+    try:
+        wordnet.ensure_loaded()
+        word_tokenize('warm up')
+    except LookupError:
+        # missing data surfaces as the same error the in-process path raises
+        pass
+
+    _worker = _WorkerState()
+
+def _tokens():
+    if _worker is None:
+        return get_token_cache()
+    # a fresh cache per chunk keeps long-lived workers from growing unbounded
+    _worker.tokens = TokenCache()
+    return _worker.tokens
+
+def bleu_rows(rows: List[Tuple[str, str]]) -> List[float]:
+    from nltk.translate.bleu_score import sentence_bleu
+
+    tokens = _tokens()
+    return [round(sentence_bleu([tokens.tokens(ref)], tokens.tokens(gen)), 2) for ref, gen in rows]
+
+def meteor_rows(rows: List[Tuple[str, str]]) -> List[float]:
+    from nltk.translate.meteor_score import meteor_score as meteor
+
+    tokens = _tokens()
+    return [round(meteor([tokens.tokens(ref)], tokens.tokens(gen)), 2) for ref, gen in rows]
+
+def rouge_rows(rows: List[Tuple[str, str]]) -> List[Dict[str, float]]:
+    if _worker is None:
+        from rouge_score import rouge_scorer
+        scorer = rouge_scorer.RougeScorer(ROUGE_TYPES, tokenizer=get_token_cache().rouge_tokenizer())
+    else:
+        _tokens()
+        scorer = _worker.rouge
+
+    return [
+        {k: round(v.fmeasure, 2) for k, v in scorer.score(ref, gen).items()}
+        for ref, gen in rows
+    ]
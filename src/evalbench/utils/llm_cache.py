@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from types import SimpleNamespace
+from evalbench.error_handling.custom_error import Error, ErrorMessages
+
+CACHE_MODES = ('read_write', 'record', 'replay')
+
+# Persistent LLM response cache in a sqlite file (WAL mode, so several processes
+# can read and write the same cache). Entries are keyed by model, prompt hash and
+# sampling parameters.
+#   read_write: reuse and store deterministic (temperature=0) responses
+#   record:     like read_write, but store every response, e.g. to record a CI run
+#   replay:     serve every request from the cache; a miss raises instead of calling the API
+class LLMResponseCache:
+    def __init__(self, path, ttl=None, max_entries=100000, mode='read_write'):
+        if mode not in CACHE_MODES:
+            raise ValueError(f'Invalid LLM cache mode: {mode}. Expected one of {list(CACHE_MODES)}')
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, model TEXT, response TEXT, created_at REAL, accessed_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def key(request):
+        # model + messages + every sampling parameter (temperature, max_tokens, logprobs, ...)
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def cacheable(self, request):
+        return self.mode != 'read_write' or request.get('temperature') == 0
+
+    def lookup(self, request):
+        if not self.cacheable(request):
+            return None
+
+        key = self.key(request)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT response, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._count -= 1
+                row = None
+            if row:
+                self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if row:
+            return to_namespace(json.loads(row[0]))
+        if self.mode == 'replay':
+            raise Error(ErrorMessages.LLM_CACHE_MISS, model=request.get('model'), key=key[:12])
+        return None
+
+    def store(self, request, completion):
+        if self.mode == 'replay' or not self.cacheable(request):
+            return
+
+        key = self.key(request)
+        response = json.dumps(completion_dict(completion), ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, model, response, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, request.get('model'), response, now, now),
+            )
+            self._count += cursor.rowcount
+            self.stores += 1
+            if self.max_entries and self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # drop expired rows, then least recently used ones down to 90% of the budget
+        if self.ttl is not None:
+            self._conn.execute('DELETE FROM responses WHERE created_at < ?', (time.time() - self.ttl,))
+        excess = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0] - int(self.max_entries * 0.9)
+        if excess > 0:
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)',
+                (excess,),
+            )
+        self._count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def stats(self):
+        return {'entries': self._count, 'hits': self.hits, 'misses': self.misses, 'stores': self.stores, 'mode': self.mode}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._count = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# completions from the groq/openai SDKs are pydantic models; anything else
+# (custom transports, the openai-compatible backend) is reduced to the fields
+# the judges read: each choice's content and its logprobs
+def completion_dict(completion):
+    if hasattr(completion, 'model_dump'):
+        return completion.model_dump(exclude_none=True)
+    return {'choices': [_choice_dict(choice) for choice in completion.choices]}
+
+def _choice_dict(choice):
+    data = {'message': {'content': choice.message.content}}
+    content = getattr(getattr(choice, 'logprobs', None), 'content', None)
+    if content:
+        data['logprobs'] = {'content': [_token_dict(token) for token in content]}
+    return data
+
+def _token_dict(token):
+    data = {'token': token.token, 'logprob': token.logprob}
+    top = getattr(token, 'top_logprobs', None)
+    if top:
+        data['top_logprobs'] = [_token_dict(candidate) for candidate in top]
+    return data
+
+def to_namespace(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [to_namespace(v) for v in value]
+    return value
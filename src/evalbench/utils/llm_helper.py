@@ -0,0 +1,151 @@
+import inspect
+import time
+import asyncio
+import threading
+from typing import List
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.rate_limit import backoff_delay, is_retryable, retry_after, status_code
+
+# All LLM calls (judge metrics and agents) go through this module. Requests run
+# on one long-lived event loop in a daemon thread, so async clients and their
+# connection pools survive across calls, and the synchronous wrappers work the
+# same inside and outside an already running loop (e.g. notebooks).
+
+_COMPLETION_TOKENS = 256
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='evalbench-llm', daemon=True).start()
+        return _loop
+
+def run_sync(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+def messages_for(prompt):
+    return [{'role': 'user', 'content': prompt}]
+
+def completion_text(completion):
+    return completion.choices[0].message.content
+
+# rough prompt + completion size, corrected from the reported usage afterwards
+def estimate_tokens(request):
+    prompt_chars = sum(len(message['content']) for message in request['messages'])
+    return prompt_chars // 4 + (request.get('max_tokens') or _COMPLETION_TOKENS)
+
+async def _unwrap(response):
+    # raw responses (with_raw_response) carry the rate-limit headers;
+    # the async Groq SDK's parse() is a coroutine
+    if hasattr(response, 'parse') and hasattr(response, 'headers'):
+        completion = response.parse()
+        if inspect.isawaitable(completion):
+            completion = await completion
+        return completion, response.headers
+    return response, None
+
+async def _transport(request, cfg):
+    if cfg.async_transport is not None:
+        return await cfg.async_transport(**request)
+    return await cfg.llm_backend.create(**request)
+
+# one request through the shared rate limiter and adaptive concurrency limit,
+# retried with jittered exponential backoff on throttling and transient errors
+async def send(request, cfg):
+    limiter = cfg.rate_limiter.resolve()
+    concurrency = cfg.llm_concurrency.resolve()
+    estimate = estimate_tokens(request)
+
+    attempt = 0
+    while True:
+        await limiter.acquire(estimate)
+        await concurrency.acquire()
+        started = time.monotonic()
+        try:
+            response = await _transport(request, cfg)
+        except Exception as exc:
+            if not is_retryable(exc) or attempt >= cfg.llm_max_retries:
+                raise
+            error = exc
+        else:
+            error = None
+        finally:
+            await concurrency.release()
+
+        if error is None:
+            concurrency.on_success(time.monotonic() - started)
+            completion, headers = await _unwrap(response)
+            limiter.update_from_headers(headers)
+            usage = getattr(completion, 'usage', None)
+            limiter.settle(estimate, getattr(usage, 'total_tokens', None))
+            return completion
+
+        # a failed request still counts against the request budget, not the token budget
+        limiter.tokens.refund(estimate)
+        limiter.update_from_headers(getattr(getattr(error, 'response', None), 'headers', None))
+        wait = retry_after(error)
+        if status_code(error) == 429:
+            concurrency.on_throttle()
+            if wait:
+                limiter.pause(wait)
+        await asyncio.sleep(max(wait or 0, backoff_delay(attempt, cfg.llm_retry_base_delay, cfg.llm_retry_max_delay)))
+        attempt += 1
+
+async def acreate(prompt, temperature=None, cfg=None, **params):
+    cfg = cfg or get_config()
+    request = {'model': cfg.llm, 'messages': messages_for(prompt), **params}
+    if temperature is not None:
+        request['temperature'] = temperature
+
+    cache = cfg.llm_cache
+    if cache is not None:
+        cached = cache.lookup(request)
+        if cached is not None:
+            return cached
+
+    completion = await send(request, cfg)
+    if cache is not None:
+        cache.store(request, completion)
+    return completion
+
+async def acomplete(prompt, temperature=None, cfg=None, **params) -> str:
+    return completion_text(await acreate(prompt, temperature, cfg=cfg, **params))
+
+def complete(prompt, temperature=None, **params) -> str:
+    cfg = get_config()
+    return run_sync(acomplete(prompt, temperature, cfg=cfg, **params))
+
+# Run many prompts with at most `concurrency` requests in flight. Results keep
+# the order of `prompts`; the first failed request is raised.
+async def acreate_many(prompts: List[str], temperature=None, concurrency=None, cfg=None, **params):
+    cfg = cfg or get_config()
+    semaphore = asyncio.Semaphore(concurrency or cfg.judge_concurrency)
+
+    async def bounded(prompt):
+        async with semaphore:
+            return await acreate(prompt, temperature, cfg=cfg, **params)
+
+    tasks = [asyncio.ensure_future(bounded(prompt)) for prompt in prompts]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+async def acomplete_many(prompts: List[str], temperature=None, concurrency=None, cfg=None, **params) -> List[str]:
+    completions = await acreate_many(prompts, temperature, concurrency, cfg=cfg, **params)
+    return [completion_text(completion) for completion in completions]
+
+def complete_many(prompts: List[str], temperature=None, concurrency=None, **params) -> List[str]:
+    cfg = get_config()
+    return run_sync(acomplete_many(prompts, temperature, concurrency, cfg=cfg, **params))
+
+# like complete_many, but returns the completions (e.g. to read logprobs)
+def create_many(prompts: List[str], temperature=None, concurrency=None, **params):
+    cfg = get_config()
+    return run_sync(acreate_many(prompts, temperature, concurrency, cfg=cfg, **params))
@@ -0,0 +1,92 @@
+import time
+import threading
+import contextvars
+
+# Metrics are grouped by the resource they wait on:
+#   io:    LLM judges (network bound)
+#   cpu:   lexical and retrieval metrics
+#   model: local model inference (embeddings, NLI, BERTScore)
+# Each class gets its own thread pool, so a run overlaps judge requests with
+# lexical scoring and model inference instead of waiting on them in series.
+RESOURCE_CLASSES = ('io', 'cpu', 'model')
+DEFAULT_METRIC_CONCURRENCY = {'io': 4, 'cpu': 1, 'model': 1}
+
+# Per-metric durations of one scheduled run next to its wall-clock time.
+class ScheduleReport:
+    def __init__(self):
+        self.metrics = {}
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, name, resource, seconds):
+        with self._lock:
+            self.metrics[name] = {'resource': resource, 'seconds': seconds}
+
+    @property
+    def serial_seconds(self):
+        return sum(entry['seconds'] for entry in self.metrics.values())
+
+    def stats(self):
+        classes = {}
+        for entry in self.metrics.values():
+            classes[entry['resource']] = classes.get(entry['resource'], 0.0) + entry['seconds']
+        return {
+            'wall_seconds': round(self.wall_seconds, 4),
+            'serial_seconds': round(self.serial_seconds, 4),
+            'saved_seconds': round(max(0.0, self.serial_seconds - self.wall_seconds), 4),
+            'classes': {name: round(seconds, 4) for name, seconds in classes.items()},
+            'metrics': {name: round(entry['seconds'], 4) for name, entry in self.metrics.items()},
+        }
+
+def _timed(report, name, resource, func, ready):
+    if ready is not None:
+        ready.result()
+    start = time.perf_counter()
+    try:
+        return func()
+    finally:
+        report.record(name, resource, time.perf_counter() - start)
+
+# Run `tasks` [(name, resource class, callable)] and return their results in
+# task order. `setup` maps a resource class to a callable that must finish
+# before that class's tasks start (e.g. prefetching fused judge scores).
+# With `concurrency=None` everything runs in order on the calling thread.
+def run_scheduled(tasks, concurrency=None, setup=None, report=None):
+    report = report or ScheduleReport()
+    setup = setup or {}
+    start = time.perf_counter()
+
+    if concurrency is None:
+        for resource, prepare in setup.items():
+            if any(task[1] == resource for task in tasks):
+                prepare()
+        results = [_timed(report, name, resource, func, None) for name, resource, func in tasks]
+        report.wall_seconds = time.perf_counter() - start
+        return results
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    executors = {}
+    ready = {}
+    futures = []
+    try:
+        for name, resource, func in tasks:
+            if resource not in executors:
+                executors[resource] = ThreadPoolExecutor(
+                    max_workers=concurrency.get(resource, 1),
+                    thread_name_prefix=f'evalbench-{resource}',
+                )
+                if resource in setup:
+                    # setup is queued first, so it runs before the class's metrics
+                    ready[resource] = executors[resource].submit(contextvars.copy_context().run, setup[resource])
+            # each task runs in a copy of the caller's context, so it sees the active run and its caches
+            futures.append(executors[resource].submit(
+                contextvars.copy_context().run, _timed, report, name, resource, func, ready.get(resource),
+            ))
+        results = [future.result() for future in futures]
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+
+    report.wall_seconds = time.perf_counter() - start
+    return results
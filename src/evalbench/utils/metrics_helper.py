@@ -1,12 +1,14 @@
-import nltk
 import importlib
 import inspect
+import threading
 from functools import wraps
 from typing import Callable, List, Any
 from evalbench.runtime_setup.runtime import get_config
 from evalbench.utils.output_control import is_printing_suppressed, print_results, save_results
 import evalbench
 
+_output_lock = threading.Lock()
+
 def _get_input_data(func, args, kwargs):
     from inspect import signature
     sig = signature(func)
@@ -27,10 +29,12 @@ def handle_output():
                 error_message = str(e)
 
             input_data = _get_input_data(func, args, kwargs)
-            if cfg.output_mode == 'print' and not is_printing_suppressed():
-                print_results(func.__name__, input_data, result, error_message)
-            elif cfg.output_mode == 'save':
-                save_results(func.__name__, input_data, result, error_message)
+            # one metric's records stay together when metrics run concurrently
+            with _output_lock:
+                if cfg.output_mode == 'print' and not is_printing_suppressed():
+                    print_results(func.__name__, input_data, result, error_message)
+                elif cfg.output_mode == 'save':
+                    save_results(func.__name__, input_data, result, error_message)
 
             if error_message:
                 return {'error': error_message}
@@ -39,30 +43,42 @@ def handle_output():
     return decorator
 
 # Decorator to register metrics with their required arguments
-def register_metric(name: str, required_args: List[str], arg_types: List[Any], module: str):
+# (LLM-judge metrics also pass their rubric, so judges over the same inputs can be fused;
+# `resource` is the class evaluate_module schedules the metric on: io, cpu or model)
+def register_metric(name: str, required_args: List[str], arg_types: List[Any], module: str, rubric=None, resource='cpu'):
     def decorator(func: Callable):
         evalbench.metric_registry[name+'_score'] = {
             'func': func,
+            'func_name': func.__name__,
             'required_args': required_args,
             'arg_types': arg_types,
             'module': module,
+            'rubric': rubric,
+            'resource': resource,
         }
         return func
     return decorator
 
-# expose predefined metrics for package usage
-def expose_metrics(module):
-    for public_name, module_path in module.items():
-        mod = importlib.import_module(f'evalbench.{module_path}')
-        setattr(evalbench, public_name, mod)
-        if hasattr(evalbench, '__all__'):
-            evalbench.__all__.append(public_name)
+# Registry entry for a predefined metric whose module has not been imported yet.
+# Looking up 'func' imports the module, whose @register_metric replaces this entry.
+class LazyMetricEntry(dict):
+    def __init__(self, name, meta):
+        super().__init__(meta)
+        self.name = name
+
+    def __missing__(self, key):
+        if key != 'func':
+            raise KeyError(key)
+        importlib.import_module(f'evalbench.{evalbench.MODULES[self["module"]]}')
+        return evalbench.metric_registry[self.name]['func']
 
-        for name, obj in inspect.getmembers(mod):
-            if callable(obj) and not name.startswith('_'):
-                setattr(evalbench, name, obj)
-                if hasattr(evalbench, '__all__'):
-                    evalbench.__all__.append(name)
+    def get(self, key, default=None):
+        if key == 'func':
+            return self['func']
+        return super().get(key, default)
+
+def build_metric_registry(metrics):
+    return {name: LazyMetricEntry(name, meta) for name, meta in metrics.items()}
 
 # expose metrics module
 def expose_custom_metrics(module):
@@ -79,6 +95,8 @@ def expose_custom_metrics(module):
 
 # download NLTK data if not present
 def download_nltk_data():
+    import nltk
+
     try:
         nltk.data.find('tokenizers/punkt')
     except LookupError:
@@ -95,7 +113,7 @@ def show_metrics():
     print("-" * 120)
 
     for name, meta in evalbench.metric_registry.items():
-        func = meta['func'].__name__
+        func = meta.get('func_name') or meta['func'].__name__
         module = meta['module']
         required_args = ", ".join(meta['required_args'])
         arg_types = ", ".join(t.__name__ if hasattr(t, '__name__') else str(t) for t in meta['arg_types'])
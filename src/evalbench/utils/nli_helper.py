@@ -0,0 +1,175 @@
+import re
+from typing import List, Dict
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.runtime_setup.run_scope import get_run_cache
+
+NLI_LABELS = ('entailment', 'neutral', 'contradiction')
+WINDOW_MODES = ('sentence', 'token')
+AGGREGATIONS = ('max_entailment', 'mean')
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+# Direct premise/hypothesis scorer over an MNLI sequence classifier. Unlike the
+# zero-shot pipeline, which runs one NLI pass per candidate label, a single
+# forward pass yields the entailment, neutral and contradiction probabilities.
+class NLIScorer:
+    def __init__(self, model_name):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        self._torch = torch
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+
+        label2id = {label.lower(): idx for label, idx in self.model.config.label2id.items()}
+        missing = [label for label in NLI_LABELS if label not in label2id]
+        if missing:
+            raise ValueError(f'{model_name} is not an NLI model: missing labels {missing}')
+        self.label_ids = {label: label2id[label] for label in NLI_LABELS}
+
+    def predict(self, premises: List[str], hypotheses: List[str], batch_size: int = 16) -> List[Dict[str, float]]:
+        if not premises:
+            return []
+        probs = self._torch.softmax(self.logits(premises, hypotheses, batch_size), dim=-1)
+        return [
+            {label: float(row[idx]) for label, idx in self.label_ids.items()}
+            for row in probs
+        ]
+
+    # Same scores as the HF zero-shot pipeline (single label): each candidate label
+    # becomes a hypothesis, and the entailment logits are softmaxed across labels.
+    # All (sequence, label) pairs of the batch go through one batched pass.
+    def zero_shot(self, sequences: List[str], candidate_labels: List[str],
+                  hypothesis_template: str = 'This example is {}.', batch_size: int = 16) -> List[Dict[str, float]]:
+        if not sequences:
+            return []
+        premises = [seq for seq in sequences for _ in candidate_labels]
+        hypotheses = [hypothesis_template.format(label) for _ in sequences for label in candidate_labels]
+
+        entailment = self.logits(premises, hypotheses, batch_size)[:, self.label_ids['entailment']]
+        scores = self._torch.softmax(entailment.reshape(len(sequences), len(candidate_labels)), dim=-1)
+        return [dict(zip(candidate_labels, (float(score) for score in row))) for row in scores]
+
+    # Batched forward passes. Pairs are sorted by token length so each batch pads
+    # to similar lengths, and the logits are scattered back to the input order.
+    def logits(self, premises: List[str], hypotheses: List[str], batch_size: int = 16):
+        encoded = self.tokenizer(list(premises), list(hypotheses), truncation=True)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+
+        results = [None] * len(lengths)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            batch = self.tokenizer.pad(
+                {key: [encoded[key][i] for i in bucket] for key in encoded.keys()},
+                return_tensors='pt',
+            ).to(self.model.device)
+            with self._torch.no_grad():
+                batch_logits = self.model(**batch).logits
+            for row, i in enumerate(bucket):
+                results[i] = batch_logits[row]
+
+        return self._torch.stack(results)
+
+    # Split a context into premise windows of at most `size` tokens: whole sentences
+    # packed greedily ('sentence'), or overlapping token spans ('token').
+    def windows(self, context: List[str], mode: str = 'sentence', size: int = 400, stride: int = None) -> List[str]:
+        if mode == 'token':
+            ids = self.tokenizer(' '.join(context), add_special_tokens=False)['input_ids']
+            stride = stride or size - size // 4
+            starts = list(range(0, max(len(ids) - size, 0) + 1, stride))
+            if starts[-1] + size < len(ids):
+                starts.append(len(ids) - size)
+            return [self.tokenizer.decode(ids[start:start + size]) for start in starts]
+
+        sentences = [s for passage in context for s in _SENTENCE_BOUNDARY.split(passage.strip()) if s]
+        lengths = [len(ids) for ids in self.tokenizer(sentences, add_special_tokens=False)['input_ids']]
+
+        windows, current, current_length = [], [], 0
+        for sentence, length in zip(sentences, lengths):
+            if current and current_length + length > size:
+                windows.append(' '.join(current))
+                current, current_length = [], 0
+            current.append(sentence)
+            current_length += length
+        if current:
+            windows.append(' '.join(current))
+        return windows
+
+# per-run memo of NLI results, so metrics over the same pairs share one pass
+class NLICache:
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+def nli_probabilities(premises: List[str], hypotheses: List[str]) -> List[Dict[str, float]]:
+    cfg = get_config()
+    cache = get_run_cache('nli', NLICache)
+
+    pairs = list(zip(premises, hypotheses))
+    missing = list(dict.fromkeys(pair for pair in pairs if pair not in cache.entries))
+    cache.hits += len(pairs) - len(missing)
+    cache.misses += len(missing)
+
+    if missing:
+        predictions = cfg.nli_scorer.predict(
+            [p for p, _ in missing],
+            [h for _, h in missing],
+            batch_size=cfg.nli_batch_size,
+        )
+        cache.entries.update(zip(missing, predictions))
+
+    return [cache.entries[pair] for pair in pairs]
+
+# NLI of each generated text against its (list of passages) context. Without a
+# window mode the passages are joined into one premise, which the model truncates
+# at its max length. With nli_window_mode the context is split into windows that
+# are scored in waves (the next window of every undecided row per batch) and
+# aggregated; with max_entailment a row stops once a window entails the
+# hypothesis above nli_early_exit.
+def context_nli_probabilities(context: List[List[str]], hypotheses: List[str]) -> List[Dict[str, float]]:
+    cfg = get_config()
+    if not cfg.nli_window_mode:
+        return nli_probabilities([' '.join(ctx) for ctx in context], hypotheses)
+
+    scorer = cfg.nli_scorer
+    windows = [
+        scorer.windows(ctx, cfg.nli_window_mode, cfg.nli_window_size, cfg.nli_window_stride)
+        for ctx in context
+    ]
+    early_exit = cfg.nli_early_exit if cfg.nli_aggregation == 'max_entailment' else None
+
+    scored = [[] for _ in hypotheses]
+    active = [i for i, row_windows in enumerate(windows) if row_windows]
+    step = 0
+    while active:
+        probabilities = nli_probabilities([windows[i][step] for i in active], [hypotheses[i] for i in active])
+        undecided = []
+        for i, probs in zip(active, probabilities):
+            scored[i].append(probs)
+            entailed = early_exit is not None and probs['entailment'] >= early_exit
+            if step + 1 < len(windows[i]) and not entailed:
+                undecided.append(i)
+        active = undecided
+        step += 1
+
+    return [aggregate_windows(row, cfg.nli_aggregation) for row in scored]
+
+def aggregate_windows(window_probabilities: List[Dict[str, float]], aggregation: str = 'max_entailment') -> Dict[str, float]:
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f'Unknown aggregation: {aggregation}. Expected one of {list(AGGREGATIONS)}')
+    if not window_probabilities:
+        # an empty context neither entails nor contradicts the hypothesis
+        return {'entailment': 0.0, 'neutral': 1.0, 'contradiction': 0.0}
+    if aggregation == 'max_entailment':
+        return max(window_probabilities, key=lambda probs: probs['entailment'])
+    return {
+        label: sum(probs[label] for probs in window_probabilities) / len(window_probabilities)
+        for label in NLI_LABELS
+    }
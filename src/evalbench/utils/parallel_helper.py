@@ -0,0 +1,60 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils import lexical_helper
+
+_executors = {}
+_lock = threading.Lock()
+
+def _get_executor(workers):
+    with _lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=lexical_helper.init_worker)
+            _executors[workers] = executor
+        return executor
+
+def _discard_executor(workers, futures=()):
+    with _lock:
+        executor = _executors.pop(workers, None)
+    # shutdown(cancel_futures=True) needs Python 3.9
+    for future in futures:
+        future.cancel()
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+@atexit.register
+def shutdown_executors():
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+# Run a row kernel over zipped columns. Large batches are split into chunks and
+# scored in the shared process pool (results come back in input order); small
+# batches, or configs without parallel_workers, stay in-process.
+def map_rows(kernel, *columns, workers=None, chunk_size=None):
+    cfg = get_config()
+    rows = list(zip(*columns))
+    workers = cfg.parallel_workers if workers is None else workers
+    workers = min(workers or 0, os.cpu_count() or 1)
+    chunk_size = chunk_size or cfg.parallel_chunk_size
+
+    if workers <= 1 or len(rows) < cfg.parallel_min_batch:
+        return kernel(rows)
+
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    executor = _get_executor(workers)
+    futures = [executor.submit(kernel, chunk) for chunk in chunks]
+    try:
+        chunk_results = [future.result() for future in futures]
+    except BrokenProcessPool:
+        # a worker died (e.g. OOM); drop the pool so the next call starts a fresh one
+        _discard_executor(workers, futures)
+        raise
+
+    return [score for chunk in chunk_results for score in chunk]
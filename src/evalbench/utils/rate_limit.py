@@ -0,0 +1,188 @@
+import re
+import time
+import asyncio
+import random
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+
+# '2m59.56s', '7.66s', '120ms' or plain seconds, as sent in rate-limit headers
+def parse_duration(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        parts = _DURATION_PART.findall(value)
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts) if parts else None
+
+def _header_int(headers, name):
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+# Per-minute token bucket. `rate=None` means no configured limit, in which case
+# the bucket only enforces what the provider reports through response headers.
+class TokenBucket:
+    def __init__(self, rate_per_minute=None):
+        self.rate = rate_per_minute
+        self.tokens = float(rate_per_minute) if rate_per_minute else float('inf')
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        if self.rate:
+            self.tokens = min(float(self.rate), self.tokens + (now - self._updated) * self.rate / 60)
+        self._updated = now
+
+    # seconds to wait before `amount` can be taken; takes it when 0
+    def reserve(self, amount):
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        # a request larger than the whole bucket only waits for a full bucket
+        amount = min(amount, self.rate) if self.rate else amount
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        if not self.rate:
+            return 0.0
+        return (amount - self.tokens) * 60 / self.rate
+
+    def refund(self, amount):
+        if self.rate:
+            self.tokens = min(float(self.rate), self.tokens + amount)
+
+    # sync with the provider's view: remaining budget and when it resets
+    def observe(self, remaining, reset_seconds):
+        now = time.monotonic()
+        self._refill(now)
+        if remaining is not None:
+            if self.rate:
+                self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0 and reset_seconds:
+                self.blocked_until = max(self.blocked_until, now + reset_seconds)
+
+    def pause(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+# Shared requests-per-minute and tokens-per-minute limits for one provider.
+class RateLimiter:
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.waited = 0.0
+
+    async def acquire(self, tokens):
+        while True:
+            wait = self.requests.reserve(1)
+            if wait == 0:
+                wait = self.tokens.reserve(tokens)
+                if wait == 0:
+                    return
+                self.requests.refund(1)
+            self.waited += wait
+            await asyncio.sleep(wait)
+
+    # correct the token estimate once the real usage is known
+    def settle(self, estimated, actual):
+        if actual is None:
+            return
+        if actual < estimated:
+            self.tokens.refund(estimated - actual)
+        else:
+            self.tokens.tokens -= actual - estimated
+
+    def update_from_headers(self, headers):
+        if not headers:
+            return
+        self.requests.observe(
+            _header_int(headers, 'x-ratelimit-remaining-requests'),
+            parse_duration(headers.get('x-ratelimit-reset-requests')),
+        )
+        self.tokens.observe(
+            _header_int(headers, 'x-ratelimit-remaining-tokens'),
+            parse_duration(headers.get('x-ratelimit-reset-tokens')),
+        )
+
+    def pause(self, seconds):
+        self.requests.pause(seconds)
+
+# AIMD concurrency limit: grows by ~1 per window of successful requests, halves
+# on throttling or when latency climbs well above its running baseline, and
+# never exceeds `maximum` in-flight requests.
+class AdaptiveConcurrency:
+    def __init__(self, maximum, minimum=1, latency_factor=2.0):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.latency_factor = latency_factor
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self.baseline = None
+        self._last_decrease = 0.0
+        self._condition = None
+
+    def _get_condition(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < max(self.minimum, int(self.limit)))
+            self.in_flight += 1
+
+    async def release(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self, latency):
+        if self.baseline is None:
+            self.baseline = latency
+        elif latency > self.latency_factor * self.baseline:
+            self._decrease()
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+        self.baseline = 0.9 * self.baseline + 0.1 * latency
+
+    def on_throttle(self):
+        self._decrease()
+
+    def _decrease(self):
+        # at most once per typical request latency, so one burst halves once
+        now = time.monotonic()
+        if now - self._last_decrease < (self.baseline or 0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit / 2)
+
+# full-jitter exponential backoff
+def backoff_delay(attempt, base_delay=1.0, max_delay=60.0):
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+def status_code(exc):
+    code = getattr(exc, 'status_code', None)
+    if code is None:
+        code = getattr(getattr(exc, 'response', None), 'status_code', None)
+    return code
+
+def retry_after(exc):
+    headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    return parse_duration(headers.get('retry-after'))
+
+# throttling, server errors, timeouts and dropped connections are worth retrying
+def is_retryable(exc):
+    code = status_code(exc)
+    if code is not None:
+        return code in (408, 409, 429) or code >= 500
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError, TimeoutError)):
+        return True
+    # SDK and httpx network errors, matched by name so no client library is imported
+    names = [cls.__name__ for cls in type(exc).__mro__]
+    return any(name in ('TransportError', 'NetworkError') or 'Connection' in name or 'Timeout' in name for name in names)
@@ -0,0 +1,208 @@
+import numpy as np
+from itertools import chain
+from collections import defaultdict
+from typing import List
+from evalbench.runtime_setup.run_scope import get_run_cache
+import evalbench.error_handling.validation_helpers as validation
+
+_discounts = np.zeros(0)
+
+# 1 / log2(rank + 1) for ranks 1..k, grown on demand and shared by every call
+def discount_table(k: int) -> np.ndarray:
+    global _discounts
+    if len(_discounts) < k:
+        _discounts = 1.0 / np.log2(np.arange(2, max(k, 2 * len(_discounts)) + 2))
+    return _discounts[:k]
+
+def _interner():
+    # maps each new document id to the next integer, entirely in C via map()
+    vocab = defaultdict()
+    vocab.default_factory = vocab.__len__
+    return vocab
+
+def _flatten(lists, limit, vocab):
+    lengths = np.fromiter(map(len, lists), np.int64, len(lists))
+    if limit is not None and lengths.max(initial=0) > limit:
+        lengths = np.minimum(lengths, limit)
+        lists = (docs[:limit] for docs in lists)
+    ids = np.fromiter(map(vocab.__getitem__, chain.from_iterable(lists)), np.int64, int(lengths.sum()))
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    cols = np.arange(len(ids)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return ids, rows, cols, lengths
+
+# Hits of each query's top-k retrieved documents against its relevant set, as
+# (queries x k) boolean matrices. Document ids are mapped to integers once for
+# the whole batch. `hits` marks every relevant position (repeated documents
+# count again, as in DCG); `first_hits` only a document's first occurrence
+# (set semantics, as in recall and precision). With graded relevance
+# (`grades`: one {doc: grade} dict per query) nDCG uses 2^grade - 1 gains and
+# takes its ideal ranking from the grades instead of the retrieved hits.
+class HitMatrix:
+    def __init__(self, relevant_docs: List[list], retrieved_docs: List[list], k: int, grades: List[dict] = None):
+        vocab = _interner()
+        rel_ids, rel_rows, _, rel_lengths = _flatten(relevant_docs, None, vocab)
+        ret_ids, ret_rows, ret_cols, _ = _flatten(retrieved_docs, k, vocab)
+        if grades is not None:
+            graded = _flatten([list(doc_grades) for doc_grades in grades], None, vocab)
+
+        # one int64 key per (query, document) pair turns membership into a binary search
+        width = max(len(vocab), 1)
+        ret_keys = ret_rows * width + ret_ids
+        rel_keys = np.sort(rel_rows * width + rel_ids)
+        positions = np.minimum(np.searchsorted(rel_keys, ret_keys), max(len(rel_keys) - 1, 0))
+        flat_hits = rel_keys[positions] == ret_keys if len(rel_keys) else np.zeros(len(ret_keys), dtype=bool)
+
+        # first occurrence of each hit document within its query
+        hit_positions = np.flatnonzero(flat_hits)
+        first_hits = np.zeros(len(ret_keys), dtype=bool)
+        first_hits[hit_positions[np.unique(ret_keys[hit_positions], return_index=True)[1]]] = True
+
+        self.k = k
+        self.n_relevant = rel_lengths
+        self.hits = np.zeros((len(retrieved_docs), k), dtype=bool)
+        self.hits[ret_rows, ret_cols] = flat_hits
+        self.first_hits = np.zeros_like(self.hits)
+        self.first_hits[ret_rows, ret_cols] = first_hits
+
+        self.gains = self.ideal_gains = None
+        if grades is not None:
+            self._set_gains(grades, graded, width, ret_keys, ret_rows, ret_cols)
+
+    def _set_gains(self, grades, graded, width, ret_keys, ret_rows, ret_cols):
+        ids, rows, cols, _ = graded
+        gains = 2.0 ** np.fromiter(chain.from_iterable(g.values() for g in grades), np.float64, len(ids)) - 1
+        keys = rows * width + ids
+        order = np.argsort(keys)
+        keys, sorted_gains = keys[order], gains[order]
+
+        self.gains = np.zeros(self.hits.shape)
+        if len(keys):
+            positions = np.minimum(np.searchsorted(keys, ret_keys), len(keys) - 1)
+            self.gains[ret_rows, ret_cols] = np.where(keys[positions] == ret_keys, sorted_gains[positions], 0.0)
+
+        # ideal ranking: each query's k largest gains from its grades
+        order = np.lexsort((-gains, rows))
+        keep = cols < self.k
+        self.ideal_gains = np.zeros(self.hits.shape)
+        self.ideal_gains[rows[order][keep], cols[keep]] = gains[order][keep]
+
+    def recall(self) -> np.ndarray:
+        found = self.first_hits.sum(axis=1)
+        return np.divide(found, self.n_relevant, out=np.zeros(len(found)), where=self.n_relevant > 0)
+
+    def precision(self) -> np.ndarray:
+        return self.first_hits.sum(axis=1) / self.k
+
+    def ndcg(self) -> np.ndarray:
+        discounts = discount_table(self.k)
+        if self.gains is not None:
+            dcg, ideal = self.gains @ discounts, self.ideal_gains @ discounts
+            return np.divide(dcg, ideal, out=np.zeros(len(dcg)), where=ideal > 0)
+
+        dcg = self.hits @ discounts
+        # the ideal ranking puts the same hits first
+        ideal = np.concatenate(([0.0], np.cumsum(discounts)))[self.hits.sum(axis=1)]
+        return np.divide(dcg, ideal, out=np.zeros(len(dcg)), where=ideal > 0)
+
+    def mrr(self) -> np.ndarray:
+        first_rank = self.hits.argmax(axis=1) + 1
+        return np.where(self.hits.any(axis=1), 1.0 / first_rank, 0.0)
+
+    # every metric at every cutoff from cumulative hit counts and cumulative DCG
+    def curves(self, cutoffs: List[int], metrics=None) -> 'RetrievalCurves':
+        metrics = metrics or CURVE_METRICS
+        columns = np.asarray(cutoffs) - 1
+        values = {}
+
+        if 'recall' in metrics or 'precision' in metrics:
+            found = np.cumsum(self.first_hits, axis=1, dtype=np.int32)[:, columns]
+            if 'recall' in metrics:
+                relevant = self.n_relevant[:, None]
+                values['recall'] = np.divide(found, relevant, out=np.zeros(found.shape), where=relevant > 0)
+            if 'precision' in metrics:
+                values['precision'] = found / np.asarray(cutoffs)
+
+        if 'ndcg' in metrics:
+            discounts = discount_table(self.k)
+            if self.gains is not None:
+                dcg = np.cumsum(self.gains * discounts, axis=1)[:, columns]
+                ideal = np.cumsum(self.ideal_gains * discounts, axis=1)[:, columns]
+            else:
+                dcg = np.cumsum(self.hits * discounts, axis=1)[:, columns]
+                hits = np.cumsum(self.hits, axis=1, dtype=np.int32)[:, columns]
+                ideal = np.concatenate(([0.0], np.cumsum(discounts)))[hits]
+            values['ndcg'] = np.divide(dcg, ideal, out=np.zeros(dcg.shape), where=ideal > 0)
+
+        if 'mrr' in metrics:
+            first_rank = np.where(self.hits.any(axis=1), self.hits.argmax(axis=1) + 1, np.iinfo(np.int32).max)
+            values['mrr'] = np.where(first_rank[:, None] <= np.asarray(cutoffs), 1.0 / first_rank[:, None], 0.0)
+
+        return RetrievalCurves(cutoffs, values)
+
+CURVE_METRICS = ('recall', 'precision', 'ndcg', 'mrr')
+
+# Per-query metric values at several cutoffs: one (queries x cutoffs) array per metric.
+class RetrievalCurves:
+    def __init__(self, cutoffs: List[int], values: dict):
+        self.cutoffs = list(cutoffs)
+        self.values = values
+
+    def __getitem__(self, metric) -> np.ndarray:
+        return self.values[metric]
+
+    @property
+    def metrics(self):
+        return list(self.values)
+
+    # per-query values of every metric at one cutoff
+    def at(self, k: int) -> dict:
+        column = self.cutoffs.index(k)
+        return {metric: values[:, column] for metric, values in self.values.items()}
+
+    # mean over queries: {metric: {k: value}}
+    def mean(self) -> dict:
+        return {
+            metric: {k: float(value) for k, value in zip(self.cutoffs, values.mean(axis=0))}
+            for metric, values in self.values.items()
+        }
+
+    def to_dict(self) -> dict:
+        return {'cutoffs': self.cutoffs, **{metric: values.tolist() for metric, values in self.values.items()}}
+
+def retrieval_curves(relevant_docs: List[list], retrieved_docs: List[list], cutoffs: List[int], metrics=None,
+                     relevance_grades: List[dict] = None) -> RetrievalCurves:
+    validation.validate_batch_inputs(('relevant_docs', relevant_docs), ('retrieved_docs', retrieved_docs))
+    validation.validate_type_list_non_empty(('cutoffs', cutoffs))
+    for k in cutoffs:
+        validation.validate_type_int_positive_integer(k, 'cutoffs')
+    unknown = set(metrics or ()) - set(CURVE_METRICS)
+    if unknown:
+        raise ValueError(f'Unknown retrieval metrics: {sorted(unknown)}. Expected any of {list(CURVE_METRICS)}')
+
+    cutoffs = sorted(set(cutoffs))
+    return hit_matrix(relevant_docs, retrieved_docs, cutoffs[-1], relevance_grades).curves(cutoffs, metrics)
+
+# Metrics over the same batch and k within a run share one matrix.
+class HitMatrixCache:
+    def __init__(self):
+        self.entries = {}
+        self.builds = 0
+
+    def get(self, relevant_docs, retrieved_docs, k, grades=None):
+        key = (id(relevant_docs), id(retrieved_docs), id(grades), k)
+        entry = self.entries.get(key)
+        # the inputs are kept alive with the entry so their ids stay unique
+        if entry is None or entry[0] is not relevant_docs or entry[1] is not retrieved_docs or entry[2] is not grades:
+            entry = (relevant_docs, retrieved_docs, grades, HitMatrix(relevant_docs, retrieved_docs, k, grades))
+            self.entries[key] = entry
+            self.builds += 1
+        return entry[3]
+
+    def stats(self):
+        return {'matrices': len(self.entries), 'builds': self.builds}
+
+def hit_matrix(relevant_docs: List[list], retrieved_docs: List[list], k: int, grades: List[dict] = None) -> HitMatrix:
+    return get_run_cache('retrieval', HitMatrixCache).get(relevant_docs, retrieved_docs, k, grades)
+
+def rounded(values: np.ndarray) -> List[float]:
+    return [round(float(value), 2) for value in values]
@@ -0,0 +1,102 @@
+import csv
+import gzip
+import json
+import os
+from itertools import islice
+from typing import Iterable, Iterator
+
+def open_text(path, mode='r'):
+    path = os.fspath(path)
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8', newline='' if path.endswith('.csv') else None)
+
+def dataset_format(path):
+    name = os.fspath(path)
+    # str.removesuffix needs Python 3.9
+    name = name[:-3] if name.endswith('.gz') else name
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    raise ValueError(f'Unsupported dataset format: {path}. Use .jsonl or .csv (optionally .gz)')
+
+def _csv_value(value):
+    # list columns (context, retrieved_docs, ...) are stored as JSON arrays
+    if value and value[0] in '[{':
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+# One dict per dataset row, read lazily from a JSONL or CSV file.
+def iter_records(path, format=None) -> Iterator[dict]:
+    format = format or dataset_format(path)
+    with open_text(path) as f:
+        if format == 'jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif format == 'csv':
+            for row in csv.DictReader(f):
+                yield {key: _csv_value(value) for key, value in row.items()}
+        else:
+            raise ValueError(f'Unsupported dataset format: {format}. Use jsonl or csv')
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Writes records as they are produced: to a JSONL path (appended), a file-like
+# object with write(), or a callable taking one record.
+class RecordSink:
+    def __init__(self, target):
+        self.target = target
+        self.records = 0
+        self._file = None
+        self._owned = False
+        if isinstance(target, (str, os.PathLike)):
+            directory = os.path.dirname(os.fspath(target))
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open_text(target, 'a')
+            self._owned = True
+        elif hasattr(target, 'write'):
+            self._file = target
+        elif not callable(target):
+            raise ValueError('sink must be a file path, a writable file object or a callable.')
+
+    def write_many(self, records):
+        if self._file is not None:
+            self._file.writelines(json.dumps(record) + '\n' for record in records)
+            self._file.flush()
+            self.records += len(records)
+            return
+        for record in records:
+            self.target(record)
+            self.records += 1
+
+    # fsync file sinks, e.g. before the rows are marked done in a checkpoint
+    def sync(self):
+        if self._file is None:
+            return
+        try:
+            os.fsync(self._file.fileno())
+        except (AttributeError, OSError, ValueError):
+            # in-memory or unsupported file objects
+            pass
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
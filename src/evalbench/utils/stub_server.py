@@ -0,0 +1,161 @@
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local OpenAI-compatible chat completions server for offline load tests and
+# benchmarks of the LLM client path (concurrency, rate limiting, retries).
+#   latency:     seconds per request, plus up to `jitter` extra
+#   error_rate:  fraction of requests answered with `error_status`
+#   reply:       response text, or a callable(request_dict) -> str
+# Rate-limit headers are sent when requests_per_minute is set.
+class StubLLMServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=429, retry_after=0.0, reply='3', requests_per_minute=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.reply = reply
+        self.requests_per_minute = requests_per_minute
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = (time.monotonic(), 0)
+        self._thread = None
+        self._server = _Server((host, port), _handler(self))
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='evalbench-stub-llm', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self):
+        return {'requests': self.requests, 'errors': self.errors, 'peak_in_flight': self.peak_in_flight}
+
+    def _begin(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            fail = self._rng.random() < self.error_rate
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+
+            headers = {}
+            if self.requests_per_minute:
+                start, count = self._window
+                now = time.monotonic()
+                if now - start >= 60:
+                    start, count = now, 0
+                count += 1
+                self._window = (start, count)
+                headers = {
+                    'x-ratelimit-limit-requests': str(self.requests_per_minute),
+                    'x-ratelimit-remaining-requests': str(max(0, self.requests_per_minute - count)),
+                    'x-ratelimit-reset-requests': f'{60 - (now - start):.2f}s',
+                }
+                fail = fail or count > self.requests_per_minute
+            if fail:
+                self.errors += 1
+        return fail, delay, headers
+
+    def _end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def completion(self, request):
+        content = self.reply(request) if callable(self.reply) else self.reply
+        prompt_tokens = sum(len(m.get('content', '')) for m in request.get('messages', [])) // 4
+        choice = {'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}
+        if request.get('logprobs'):
+            token = {'token': content, 'logprob': 0.0}
+            choice['logprobs'] = {'content': [{**token, 'top_logprobs': [token]}]}
+        return {
+            'id': f'stub-{self.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'stub'),
+            'choices': [choice],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': 1, 'total_tokens': prompt_tokens + 1},
+        }
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # room for a burst of new keep-alive connections from a concurrent client
+    request_queue_size = 1024
+
+def _handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                return self._send(404, {'error': {'message': f'Unknown path {self.path}'}})
+
+            fail, delay, headers = server._begin()
+            try:
+                time.sleep(delay)
+                if fail:
+                    headers['retry-after'] = str(server.retry_after)
+                    return self._send(server.error_status, {'error': {'message': 'Injected error'}}, headers)
+                self._send(200, server.completion(json.loads(body or b'{}')), headers)
+            finally:
+                server._end()
+
+        def _send(self, status, payload, headers=None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a local OpenAI-compatible stub LLM server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=429)
+    parser.add_argument('--rpm', type=int, default=None)
+    parser.add_argument('--reply', default='3')
+    args = parser.parse_args()
+
+    stub = StubLLMServer(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                         args.error_status, reply=args.reply, requests_per_minute=args.rpm)
+    print(f'Stub LLM server listening on {stub.url}')
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
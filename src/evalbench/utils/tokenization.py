@@ -0,0 +1,73 @@
+from typing import List
+from evalbench.runtime_setup.run_scope import get_run_cache
+
+# Per-run cache of tokenized text shared by the lexical metrics (BLEU, METEOR,
+# ROUGE) and available to custom metrics, so each string is tokenized once per
+# run no matter how many metrics look at it.
+class TokenCache:
+    KINDS = ('tokens', 'normalized', 'stems')
+
+    def __init__(self):
+        self._entries = {kind: {} for kind in self.KINDS}
+        self._hits = {kind: 0 for kind in self.KINDS}
+        self._misses = {kind: 0 for kind in self.KINDS}
+        self._stemmer = None
+
+    # NLTK word tokens, as used by BLEU and METEOR
+    def tokens(self, text: str) -> List[str]:
+        return self._lookup('tokens', text, _word_tokenize)
+
+    # lowercased word tokens without punctuation-only tokens
+    def normalized(self, text: str) -> List[str]:
+        return self._lookup('normalized', text, lambda t: [
+            token.lower() for token in self.tokens(t) if any(ch.isalnum() for ch in token)
+        ])
+
+    # ROUGE tokenization with Porter stemming
+    def stems(self, text: str) -> List[str]:
+        if self._stemmer is None:
+            from rouge_score import tokenizers
+            self._stemmer = tokenizers.DefaultTokenizer(use_stemmer=True)
+        return self._lookup('stems', text, self._stemmer.tokenize)
+
+    # tokenizer object accepted by rouge_scorer.RougeScorer(tokenizer=...)
+    def rouge_tokenizer(self):
+        return _RougeTokenizer(self)
+
+    def stats(self):
+        return {
+            kind: {'entries': len(self._entries[kind]), 'hits': self._hits[kind], 'misses': self._misses[kind]}
+            for kind in self.KINDS
+        }
+
+    def _lookup(self, kind, text, compute):
+        entries = self._entries[kind]
+        if text in entries:
+            self._hits[kind] += 1
+            return entries[text]
+        self._misses[kind] += 1
+        entries[text] = compute(text)
+        return entries[text]
+
+class _RougeTokenizer:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def tokenize(self, text):
+        return self.cache.stems(text)
+
+def _word_tokenize(text):
+    from nltk.tokenize import word_tokenize
+    return word_tokenize(text)
+
+def get_token_cache() -> TokenCache:
+    return get_run_cache('tokens', TokenCache)
+
+def tokenize(text: str) -> List[str]:
+    return get_token_cache().tokens(text)
+
+def normalize(text: str) -> List[str]:
+    return get_token_cache().normalized(text)
+
+def stem_tokens(text: str) -> List[str]:
+    return get_token_cache().stems(text)
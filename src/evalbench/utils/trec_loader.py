@@ -0,0 +1,152 @@
+import json
+import heapq
+import numpy as np
+from typing import Dict, Iterator, List
+from evalbench.utils.retrieval_helper import CURVE_METRICS, HitMatrix
+from evalbench.utils.stream_helper import open_text
+
+# Streaming readers for TREC run and qrels files (and JSONL equivalents).
+#   TREC run:    qid Q0 docid rank score tag
+#   TREC qrels:  qid iter docid relevance
+#   JSONL run:   {"query_id", "doc_id", "score"} per line, or {"query_id", "docs": [ranked ids]}
+#   JSONL qrels: {"query_id", "doc_id", "relevance"} per line
+# Files ending in .gz are decompressed on the fly. Qrels are loaded whole with
+# document ids interned to integers; runs are read one query at a time, so
+# memory is bounded by the qrels plus one chunk of queries.
+
+_QUERY_KEYS = ('query_id', 'qid')
+_DOC_KEYS = ('doc_id', 'docid', 'docno')
+_GRADE_KEYS = ('relevance', 'rel', 'grade')
+
+def _is_jsonl(path):
+    path = str(path)
+    # str.removesuffix needs Python 3.9
+    path = path[:-3] if path.endswith('.gz') else path
+    return path.endswith(('.jsonl', '.ndjson'))
+
+def _field(record, keys, path, line_no):
+    for key in keys:
+        if key in record:
+            return record[key]
+    raise ValueError(f'{path}:{line_no}: missing field, expected one of {list(keys)}')
+
+def _qrels_lines(path):
+    jsonl = _is_jsonl(path)
+    with open_text(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            if jsonl:
+                record = json.loads(line)
+                yield (str(_field(record, _QUERY_KEYS, path, line_no)), str(_field(record, _DOC_KEYS, path, line_no)),
+                       float(_field(record, _GRADE_KEYS, path, line_no)))
+                continue
+            parts = line.split()
+            if len(parts) != 4:
+                raise ValueError(f'{path}:{line_no}: expected "qid iter docid relevance", got {line.strip()!r}')
+            yield parts[0], parts[2], float(parts[3])
+
+# qid -> {interned doc id: grade} for documents with a positive grade, and the interner
+def read_qrels(path, interner: Dict[str, int] = None):
+    interner = {} if interner is None else interner
+    qrels = {}
+    for qid, doc, grade in _qrels_lines(path):
+        if grade > 0:
+            doc_id = interner.setdefault(doc, len(interner))
+            qrels.setdefault(qid, {})[doc_id] = grade
+    return qrels, interner
+
+def _run_lines(path):
+    jsonl = _is_jsonl(path)
+    with open_text(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            if jsonl:
+                record = json.loads(line)
+                qid = str(_field(record, _QUERY_KEYS, path, line_no))
+                if 'docs' in record:
+                    # already ranked: descending pseudo-scores keep the given order
+                    docs = record['docs']
+                    for rank, doc in enumerate(docs):
+                        yield qid, str(doc), float(len(docs) - rank)
+                else:
+                    yield qid, str(_field(record, _DOC_KEYS, path, line_no)), float(record.get('score', 0.0))
+                continue
+            parts = line.split()
+            if len(parts) != 6:
+                raise ValueError(f'{path}:{line_no}: expected "qid Q0 docid rank score tag", got {line.strip()!r}')
+            yield parts[0], parts[2], float(parts[4])
+
+def _ranked(docs, depth):
+    # as trec_eval: score descending, ties broken by document id descending
+    if depth is None:
+        return [doc for _, doc in sorted(docs, reverse=True)]
+    return [doc for _, doc in heapq.nlargest(depth, docs)]
+
+# (qid, ranked document ids) per query; a query's lines must be contiguous
+def iter_run(path, depth: int = None) -> Iterator[tuple]:
+    seen = set()
+    current, docs = None, []
+    for qid, doc, score in _run_lines(path):
+        if qid != current:
+            if current is not None:
+                yield current, _ranked(docs, depth)
+            if qid in seen:
+                raise ValueError(f'{path}: query {qid!r} appears in more than one block; sort the run by query id')
+            seen.add(qid)
+            current, docs = qid, []
+        docs.append((score, doc))
+    if current is not None:
+        yield current, _ranked(docs, depth)
+
+# Batches of queries ready for the retrieval metrics: query ids, relevant and
+# retrieved documents as interned integers, and per-query relevance grades.
+# Queries without relevant documents in the qrels are skipped, as in trec_eval.
+def iter_trec_chunks(run_path, qrels_path, chunk_size: int = 10000, depth: int = None) -> Iterator[dict]:
+    qrels, interner = read_qrels(qrels_path)
+    chunk = _empty_chunk()
+    for qid, docs in iter_run(run_path, depth):
+        grades = qrels.get(qid)
+        if not grades:
+            continue
+        chunk['query_ids'].append(qid)
+        chunk['relevant_docs'].append(list(grades))
+        # documents absent from the qrels are never relevant and share one id
+        chunk['retrieved_docs'].append([interner.get(doc, -1) for doc in docs])
+        chunk['relevance_grades'].append(grades)
+        if len(chunk['query_ids']) >= chunk_size:
+            yield chunk
+            chunk = _empty_chunk()
+    if chunk['query_ids']:
+        yield chunk
+
+def _empty_chunk():
+    return {'query_ids': [], 'relevant_docs': [], 'retrieved_docs': [], 'relevance_grades': []}
+
+# Mean retrieval metrics of a run over its judged queries at each cutoff,
+# evaluated chunk by chunk. nDCG uses the graded qrels (ideal DCG from qrels).
+def evaluate_trec(run_path, qrels_path, cutoffs: List[int] = (10,), chunk_size: int = 10000,
+                  metrics: List[str] = None) -> dict:
+    cutoffs = sorted(set(cutoffs))
+    if not cutoffs or any(not isinstance(k, int) or k <= 0 for k in cutoffs):
+        raise ValueError(f'cutoffs must be positive integers, got {cutoffs}')
+    metrics = list(metrics or CURVE_METRICS)
+    unknown = set(metrics) - set(CURVE_METRICS)
+    if unknown:
+        raise ValueError(f'Unknown retrieval metrics: {sorted(unknown)}. Expected any of {list(CURVE_METRICS)}')
+
+    totals = {metric: np.zeros(len(cutoffs)) for metric in metrics}
+    queries = 0
+    for chunk in iter_trec_chunks(run_path, qrels_path, chunk_size, depth=cutoffs[-1]):
+        matrix = HitMatrix(chunk['relevant_docs'], chunk['retrieved_docs'], cutoffs[-1], chunk['relevance_grades'])
+        curves = matrix.curves(cutoffs, metrics)
+        for metric in metrics:
+            totals[metric] += curves[metric].sum(axis=0)
+        queries += len(chunk['query_ids'])
+
+    result = {'queries': queries}
+    for metric in metrics:
+        means = totals[metric] / queries if queries else totals[metric]
+        result[metric] = {k: round(float(value), 4) for k, value in zip(cutoffs, means)}
+    return result
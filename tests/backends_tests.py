@@ -0,0 +1,47 @@
+import pytest
+from evalbench.runtime_setup.config import EvalConfig
+from evalbench.runtime_setup.runtime import get_config, set_config
+from evalbench.utils.llm_helper import complete_many
+from evalbench.utils.stub_server import StubLLMServer
+
+@pytest.fixture
+def stub_config():
+    previous = get_config()
+    with StubLLMServer(latency=0.01, error_rate=0.2, seed=0, reply=lambda request: request['messages'][0]['content']) as stub:
+        cfg = EvalConfig(
+            llm_backend='openai',
+            llm_base_url=stub.url,
+            judge_concurrency=4,
+            llm_max_retries=10,
+            llm_retry_base_delay=0.001,
+        )
+        set_config(cfg)
+        yield cfg, stub
+        cfg.close()
+    set_config(previous)
+
+def test_openai_backend_retries_injected_errors(stub_config):
+    cfg, stub = stub_config
+    prompts = [f'prompt {i}' for i in range(30)]
+
+    assert complete_many(prompts, temperature=0) == prompts
+    assert stub.stats()['errors'] > 0
+    assert stub.stats()['peak_in_flight'] <= 4
+
+def test_openai_backend_requires_base_url():
+    with pytest.raises(ValueError):
+        EvalConfig(llm_backend='openai').validate()
+
+def test_groq_backend_against_stub_server(monkeypatch):
+    previous = get_config()
+    with StubLLMServer(reply=lambda request: request['messages'][0]['content']) as stub:
+        # the real AsyncGroq client, pointed at the stub's OpenAI-compatible routes
+        monkeypatch.setenv('GROQ_BASE_URL', stub.url[:-len('/v1')])
+        cfg = EvalConfig(groq_api_key='test', llm_max_retries=0)
+        set_config(cfg)
+        try:
+            assert complete_many(['first', 'second'], temperature=0) == ['first', 'second']
+            assert stub.stats()['requests'] == 2
+        finally:
+            cfg.close()
+            set_config(previous)
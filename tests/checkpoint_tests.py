@@ -0,0 +1,147 @@
+import json
+import evalbench
+from evalbench.metrics.evaluate_module import evaluate_module
+from evalbench.metrics.evaluate_stream import evaluate_stream
+from evalbench.runtime_setup.config import EvalConfig
+from evalbench.runtime_setup.runtime import get_config, set_config
+from evalbench.utils.checkpoint import RunCheckpoint
+
+def test_checkpoint_batches_writes_and_resumes(tmp_path):
+    path = tmp_path / 'run.ckpt'
+    ckpt = RunCheckpoint(path, batch_size=3, fsync_interval=60)
+    ckpt.record(0, 'm', 0.5)
+    ckpt.record(1, 'm', 0.25)
+    assert path.read_text() == ''
+    ckpt.record(2, 'm', 1.0)
+    assert len(path.read_text().splitlines()) == 3 and ckpt.syncs == 1
+    ckpt.set_meta('agent_metrics', ['m'])
+    ckpt.close()
+
+    # a torn final line from a crash is ignored
+    with open(path, 'a') as f:
+        f.write('{"row": 3, "metr')
+    resumed = RunCheckpoint(path, resume=True)
+    assert resumed.get(1, 'm') == 0.25 and not resumed.done(3, 'm')
+    assert resumed.meta == {'agent_metrics': ['m']} and resumed.stats()['restored'] == 3
+    resumed.record(3, 'm', 2.0)
+    resumed.close()
+
+    # the record written after the torn line survives a second resume
+    again = RunCheckpoint(path, resume=True)
+    assert again.get(3, 'm') == 2.0 and again.stats()['restored'] == 4
+    again.close()
+
+    assert not RunCheckpoint(path).done(0, 'm')
+
+def test_record_does_not_keep_outputs(tmp_path):
+    import tracemalloc
+
+    ckpt = RunCheckpoint(tmp_path / 'run.ckpt', batch_size=100, fsync_interval=60)
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for row in range(2000):
+        ckpt.record(row, 'm', f'{row:010d}' * 1000)
+    ckpt.flush(force=True)
+    grown = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    # 20 MB of outputs; only the done keys and their file offsets stay in memory
+    assert grown < 2 * 2**20
+    assert ckpt.get(1234, 'm') == '0000001234' * 1000
+    ckpt.close()
+
+def _flaky_metric(calls, fail_from):
+    def metric(response):
+        calls.extend(response)
+        if fail_from is not None and any(int(r) >= fail_from[0] for r in response):
+            raise RuntimeError('provider outage')
+        return [int(r) * 2 for r in response]
+    return metric
+
+def _register(monkeypatch, calls, fail_from):
+    monkeypatch.setitem(evalbench.metric_registry, 'flaky_score', {
+        'func': _flaky_metric(calls, fail_from),
+        'func_name': 'flaky_score',
+        'required_args': ['response'],
+        'arg_types': [list],
+        'module': 'checkpoint_test',
+        'resource': 'io',
+    })
+
+def test_evaluate_module_resumes_only_missing_rows(monkeypatch, tmp_path):
+    calls, fail_from = [], [4]
+    _register(monkeypatch, calls, fail_from)
+    previous = get_config()
+    set_config(EvalConfig(groq_api_key='test', stream_chunk_size=2, judge_fusion=False))
+    try:
+        rows = [str(i) for i in range(6)]
+        path = tmp_path / 'run.ckpt'
+        first = evaluate_module(['checkpoint_test'], checkpoint=path, response=rows)
+        assert first == [{'metric': 'flaky_score', 'error': 'provider outage'}]
+
+        calls.clear()
+        fail_from[0] = 100
+        resumed = evaluate_module(['checkpoint_test'], checkpoint=path, resume=True, response=rows)
+        assert resumed == [{'metric': 'flaky_score', 'result': [0, 2, 4, 6, 8, 10]}]
+        assert calls == ['4', '5']
+    finally:
+        set_config(previous)
+
+def test_evaluate_stream_resume_writes_missing_records(monkeypatch, tmp_path):
+    calls = []
+    _register(monkeypatch, calls, None)
+    path = tmp_path / 'run.ckpt'
+    ckpt = RunCheckpoint(path)
+    ckpt.record('r0', 'flaky_score', 0)
+    ckpt.close()
+
+    records = []
+    rows = [{'id': f'r{i}', 'response': str(i)} for i in range(3)]
+    summary = evaluate_stream(rows, metrics=['flaky_score'], sink=records.append, id_field='id',
+                              checkpoint=path, resume=True)
+
+    assert calls == ['1', '2']
+    assert records == [{'row': 'r1', 'metric': 'flaky_score', 'output': 2},
+                       {'row': 'r2', 'metric': 'flaky_score', 'output': 4}]
+    assert summary['checkpoint']['restored'] == 1 and summary['checkpoint']['recorded'] == 2
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len([line for line in lines if 'metric' in line]) == 3
+
+def test_evaluate_stream_marks_rows_done_after_the_sink(monkeypatch, tmp_path):
+    import pytest
+
+    _register(monkeypatch, [], None)
+    path = tmp_path / 'run.ckpt'
+    rows = [{'response': str(i)} for i in range(4)]
+    written = []
+
+    def crashing_sink(record):
+        if record['row'] >= 2:
+            raise RuntimeError('sink crashed')
+        written.append(record)
+
+    with pytest.raises(RuntimeError):
+        evaluate_stream(rows, metrics=['flaky_score'], sink=crashing_sink, chunk_size=2, checkpoint=path)
+    assert [record['row'] for record in written] == [0, 1]
+
+    # rows that never reached the sink are computed and written again
+    evaluate_stream(rows, metrics=['flaky_score'], sink=written.append, chunk_size=2, checkpoint=path, resume=True)
+    assert [record['row'] for record in written] == [0, 1, 2, 3]
+
+def test_resume_rejects_different_inputs(monkeypatch, tmp_path):
+    import pytest
+    from evalbench.error_handling.custom_error import Error
+
+    _register(monkeypatch, [], None)
+    path = tmp_path / 'module.ckpt'
+    evaluate_module(['checkpoint_test'], checkpoint=path, response=['1', '2'])
+    with pytest.raises(Error):
+        evaluate_module(['checkpoint_test'], checkpoint=path, resume=True, response=['3', '4'])
+    assert evaluate_module(['checkpoint_test'], checkpoint=path, resume=True, response=['1', '2']) == \
+        [{'metric': 'flaky_score', 'result': [2, 4]}]
+
+    path = tmp_path / 'stream.ckpt'
+    evaluate_stream([{'response': '1'}], metrics=['flaky_score'], sink=lambda record: None, checkpoint=path)
+    with pytest.raises(Error):
+        evaluate_stream([{'response': '5'}], metrics=['flaky_score'], sink=lambda record: None,
+                        checkpoint=path, resume=True)
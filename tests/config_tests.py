@@ -0,0 +1,48 @@
+import pytest
+import evalbench.runtime_setup.config as config
+import evalbench.runtime_setup.model_pool as model_pool
+from evalbench.runtime_setup.config import EvalConfig, LAZY_RESOURCES
+from evalbench.runtime_setup.model_pool import ModelPool
+from evalbench.runtime_setup.resources import LazyResource
+
+@pytest.fixture
+def loads(monkeypatch):
+    loads = []
+    monkeypatch.setattr(model_pool, '_pool', ModelPool())
+    monkeypatch.setattr(config, '_load_sentence_model', lambda name: loads.append(name) or name)
+    monkeypatch.setattr(config, '_load_nli_scorer', lambda name: loads.append(name) or name)
+    return loads
+
+def test_models_load_on_first_use_only(loads):
+    cfg = EvalConfig(groq_api_key='test', sentence_model='mini', fact_check_model='mnli')
+    cfg.validate()
+    assert not any(getattr(cfg, name).loaded for name in LAZY_RESOURCES)
+    assert loads == []
+
+    assert cfg.sentence_model.upper() == 'MINI'
+    assert cfg.sentence_model.lower() == 'mini'
+    assert loads == ['mini'] and not cfg.nli_scorer.loaded
+    cfg.close()
+
+def test_warmup_preloads_named_resources(loads):
+    cfg = EvalConfig(groq_api_key='test', fact_check_model='mnli')
+    cfg.warmup(['nli_scorer'])
+    assert cfg.nli_scorer.loaded and not cfg.sentence_model.loaded
+    assert loads == ['mnli']
+
+    with pytest.raises(ValueError):
+        cfg.warmup(['gpu'])
+    cfg.close()
+
+def test_lazy_resource_loads_once_and_reloads_after_release():
+    loads = []
+    resource = LazyResource('client', lambda: loads.append(1) or {'ready': True})
+
+    assert not resource.loaded and 'not loaded' in repr(resource)
+    assert resource.get('ready')
+    assert resource.get('ready')
+    assert loads == [1]
+
+    resource.release()
+    assert not resource.loaded
+    assert resource.get('ready') and loads == [1, 1]
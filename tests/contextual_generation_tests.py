@@ -30,3 +30,122 @@ def test_groundedness_score(test_data):
     score = contextual_generation.groundedness_score(test_data['context'], test_data['generated'])
     assert all(isinstance(s, str) for s in score), \
         f'Expected groundedness scores to be string in [1, 3], but got {score}'
+
+class KeywordNLI:
+    # stand-in scorer: a window entails the hypothesis iff it mentions its last word
+    def __init__(self):
+        self.scored = []
+
+    def windows(self, context, mode, size, stride):
+        return list(context)
+
+    def predict(self, premises, hypotheses, batch_size=16):
+        self.scored.extend(premises)
+        return [
+            {'entailment': 0.95, 'neutral': 0.03, 'contradiction': 0.02}
+            if h.split()[-1] in p else {'entailment': 0.1, 'neutral': 0.6, 'contradiction': 0.3}
+            for p, h in zip(premises, hypotheses)
+        ]
+
+def test_windowed_nli_early_exit(monkeypatch):
+    from evalbench.runtime_setup.runtime import get_config
+    from evalbench.utils.nli_helper import context_nli_probabilities
+
+    cfg = get_config()
+    scorer = KeywordNLI()
+    monkeypatch.setattr(cfg, 'nli_scorer', scorer)
+    monkeypatch.setattr(cfg, 'nli_window_mode', 'sentence')
+    monkeypatch.setattr(cfg, 'nli_aggregation', 'max_entailment')
+    monkeypatch.setattr(cfg, 'nli_early_exit', 0.9)
+
+    context = [['about paris', 'about berlin', 'about rome'], ['about water', 'about ice']]
+    probs = context_nli_probabilities(context, ['the city is berlin', 'it is steam'])
+
+    assert [round(p['entailment'], 2) for p in probs] == [0.95, 0.1]
+    # the first row stops after its entailing window, 'about rome' is never scored
+    assert 'about rome' not in scorer.scored
+
+def test_aggregate_windows_without_windows():
+    from evalbench.utils.nli_helper import aggregate_windows
+
+    neutral = {'entailment': 0.0, 'neutral': 1.0, 'contradiction': 0.0}
+    assert aggregate_windows([], 'max_entailment') == neutral
+    assert aggregate_windows([], 'mean') == neutral
+    with pytest.raises(ValueError):
+        aggregate_windows([], 'median')
+
+def test_faithfulness_and_hallucination_share_one_nli_pass(monkeypatch, test_data):
+    from evalbench.runtime_setup.run_scope import run_scope
+    from evalbench.runtime_setup.runtime import get_config
+
+    scorer = KeywordNLI()
+    monkeypatch.setattr(get_config(), 'nli_scorer', scorer)
+    monkeypatch.setattr(get_config(), 'nli_window_mode', None)
+
+    with run_scope() as run:
+        faithfulness = contextual_generation.faithfulness_score(test_data['context'], test_data['generated'])
+        hallucination = contextual_generation.hallucination_score(test_data['context'], test_data['generated'])
+        stats = run.stats()['nli']
+
+    assert len(scorer.scored) == 3
+    assert stats == {'entries': 3, 'hits': 3, 'misses': 3}
+    assert [round(f + h, 2) for f, h in zip(faithfulness, hallucination)] == [1.0] * 3
+
+def test_nli_probabilities_batches_with_configured_size(monkeypatch):
+    from evalbench.runtime_setup.runtime import get_config
+    from evalbench.utils.nli_helper import nli_probabilities
+
+    batch_sizes = []
+
+    class BatchNLI(KeywordNLI):
+        def predict(self, premises, hypotheses, batch_size=16):
+            batch_sizes.append(batch_size)
+            return super().predict(premises, hypotheses, batch_size)
+
+    scorer = BatchNLI()
+    monkeypatch.setattr(get_config(), 'nli_scorer', scorer)
+    monkeypatch.setattr(get_config(), 'nli_batch_size', 4)
+
+    premises = [f'about {i}' for i in range(10)]
+    probs = nli_probabilities(premises, ['it is 3'] * 10)
+    assert batch_sizes == [4] and len(scorer.scored) == 10
+    assert [i for i, p in enumerate(probs) if p['entailment'] > 0.5] == [3]
+
+def test_nli_logits_are_bucketed_by_length_and_kept_in_order():
+    import torch
+    from types import SimpleNamespace
+    from evalbench.utils.nli_helper import NLIScorer
+
+    class Batch(dict):
+        def to(self, device):
+            return self
+
+    class Tokenizer:
+        def __call__(self, premises, hypotheses, truncation=True):
+            return {'input_ids': [[1] * len(p.split()) for p in premises]}
+
+        def pad(self, features, return_tensors='pt'):
+            width = max(len(ids) for ids in features['input_ids'])
+            return Batch(input_ids=torch.tensor([ids + [0] * (width - len(ids)) for ids in features['input_ids']]))
+
+    class Model:
+        device = 'cpu'
+
+        def __init__(self):
+            self.widths = []
+
+        def __call__(self, input_ids):
+            self.widths.append(input_ids.shape[1])
+            # logits carry each row's unpadded length, to check the scatter back
+            lengths = input_ids.sum(dim=1, keepdim=True).float()
+            return SimpleNamespace(logits=lengths.repeat(1, 3))
+
+    scorer = NLIScorer.__new__(NLIScorer)
+    scorer._torch, scorer.tokenizer, scorer.model = torch, Tokenizer(), Model()
+
+    premises = ['a ' * 5, 'a', 'a ' * 4, 'a a']
+    logits = scorer.logits(premises, ['h'] * 4, batch_size=2)
+
+    assert logits[:, 0].tolist() == [5.0, 1.0, 4.0, 2.0]
+    # short rows are padded together, long rows together
+    assert scorer.model.widths == [2, 5]
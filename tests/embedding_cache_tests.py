@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from evalbench.utils.embedding_cache import EmbeddingCache
+
+@pytest.fixture
+def vectors():
+    return np.eye(4, dtype=np.float32)
+
+def test_roundtrip_and_counters(tmp_path, vectors):
+    cache = EmbeddingCache(str(tmp_path), 'mini', max_entries=10, memory_entries=10)
+    cache.put_many(['a', 'b'], vectors[:2])
+
+    found = cache.get_many(['a', 'b', 'c'])
+    assert set(found) == {'a', 'b'}
+    assert np.allclose(found['b'], vectors[1])
+    assert cache.stats()['memory_hits'] == 2
+    assert cache.stats()['misses'] == 1
+
+def test_persists_across_instances(tmp_path, vectors):
+    EmbeddingCache(str(tmp_path), 'mini').put_many(['a'], vectors[:1])
+
+    reopened = EmbeddingCache(str(tmp_path), 'mini')
+    assert np.allclose(reopened.get_many(['a'])['a'], vectors[0])
+    assert reopened.stats()['disk_hits'] == 1
+
+    # entries are keyed by model name as well as content
+    assert EmbeddingCache(str(tmp_path), 'other').get_many(['a']) == {}
+
+def test_size_cap_evicts_least_recently_used(tmp_path, vectors):
+    cache = EmbeddingCache(str(tmp_path), 'mini', max_entries=2, memory_entries=1)
+    cache.put_many(['a', 'b'], vectors[:2])
+    cache.get_many(['a'])
+    cache.put_many(['c'], vectors[2:3])
+
+    reopened = EmbeddingCache(str(tmp_path), 'mini', max_entries=2)
+    assert set(reopened.get_many(['a', 'b', 'c'])) == {'a', 'c'}
+    assert cache.stats()['evictions'] == 1
@@ -0,0 +1,51 @@
+import csv
+import json
+import tracemalloc
+from evalbench.metrics.evaluate_stream import evaluate_stream
+
+def _rows(count):
+    for i in range(count):
+        yield {'id': f'q{i}', 'relevant_docs': ['a', 'b'], 'retrieved_docs': ['b', f'x{i}', 'a']}
+
+def test_evaluate_stream_jsonl_to_file(tmp_path):
+    dataset = tmp_path / 'data.jsonl'
+    dataset.write_text('\n'.join(json.dumps(row) for row in _rows(5)))
+    out = tmp_path / 'out' / 'results.jsonl'
+
+    summary = evaluate_stream(dataset, metrics=['recall_at_k', 'mrr_score'], sink=out, chunk_size=2, id_field='id', k=1)
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+
+    assert summary['rows'] == 5 and summary['chunks'] == 3 and summary['records'] == 10
+    assert {'row': 'q0', 'metric': 'recall_at_k_score', 'output': 0.5} in records
+    assert {'row': 'q4', 'metric': 'mrr_score', 'output': 1.0} in records
+
+def test_evaluate_stream_csv_columns_and_errors(tmp_path):
+    dataset = tmp_path / 'data.csv'
+    with open(dataset, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['gold', 'retrieved_docs'])
+        writer.writerow([json.dumps(['a']), json.dumps(['a', 'b'])])
+        writer.writerow([json.dumps(['c']), json.dumps(['a', 'b'])])
+    records = []
+
+    summary = evaluate_stream(dataset, module=['retrieval'], sink=records.append, columns={'relevant_docs': 'gold'}, k=2)
+    outputs = {(r['row'], r['metric']): r.get('output') for r in records}
+
+    assert summary['rows'] == 2 and summary['errors'] == 0
+    assert outputs[(0, 'precision_at_k_score')] == 0.5
+    assert outputs[(1, 'recall_at_k_score')] == 0.0
+
+    records.clear()
+    summary = evaluate_stream(dataset, metrics=['recall_at_k'], sink=records.append, k=2)
+    assert summary['errors'] == 2 and all('error' in record for record in records)
+
+def test_evaluate_stream_memory_is_flat():
+    def peak(count):
+        tracemalloc.start()
+        evaluate_stream(_rows(count), metrics=['ndcg_at_k'], sink=lambda record: None, chunk_size=500, k=3)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    peak(500)
+    assert peak(20000) < 2 * peak(2000)
@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+import evalbench
+from evalbench.metrics.index import PREDEFINED_METRICS
+
+HEAVY_MODULES = ['torch', 'transformers', 'sentence_transformers', 'bert_score', 'rouge_score', 'nltk', 'groq']
+IMPORT_BUDGET_SECONDS = float(os.getenv('EVALBENCH_IMPORT_BUDGET', '1.0'))
+
+def _run(snippet):
+    env = dict(os.environ)
+    src = os.path.dirname(os.path.dirname(os.path.abspath(evalbench.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (src, env.get('PYTHONPATH')) if p)
+    out = subprocess.run([sys.executable, '-c', snippet], env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def test_import_does_not_load_heavy_dependencies():
+    record = _run(f'''
+import json, sys, time
+start = time.perf_counter()
+import evalbench
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+''')
+    assert record['heavy'] == [], f'import evalbench loaded {record["heavy"]}'
+    assert record['seconds'] < IMPORT_BUDGET_SECONDS, \
+        f'import evalbench took {record["seconds"]:.3f}s, budget is {IMPORT_BUDGET_SECONDS}s'
+
+def test_registry_listable_without_importing_metrics():
+    record = _run(f'''
+import json, sys
+import evalbench
+names = list(evalbench.metric_registry)
+modules = sorted({{meta['module'] for meta in evalbench.metric_registry.values()}})
+print(json.dumps({{'names': names, 'modules': modules, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+''')
+    assert record['names'] == list(PREDEFINED_METRICS)
+    assert record['modules'] == sorted(evalbench.MODULES)
+    assert record['heavy'] == []
+
+@pytest.mark.parametrize('name', list(PREDEFINED_METRICS))
+def test_index_matches_registered_metric(name):
+    func = evalbench.metric_registry[name]['func']
+    registered = evalbench.metric_registry[name]
+    expected = PREDEFINED_METRICS[name]
+
+    assert func.__name__ == expected['func_name']
+    assert registered['required_args'] == expected['required_args']
+    assert registered['arg_types'] == expected['arg_types']
+    assert registered['module'] == expected['module']
+    assert registered['resource'] == expected['resource']
+    assert getattr(evalbench, expected['func_name']) is func
@@ -0,0 +1,85 @@
+import pytest
+from types import SimpleNamespace
+from evalbench.error_handling.custom_error import Error
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.llm_cache import LLMResponseCache
+from evalbench.utils.llm_helper import complete_many
+
+def completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def request(prompt, temperature=0):
+    return {'model': 'test-model', 'messages': [{'role': 'user', 'content': prompt}], 'temperature': temperature}
+
+class CountingTransport:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, **request):
+        self.calls += 1
+        return completion(request['messages'][0]['content'].upper())
+
+def test_cache_keys_on_sampling_params(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / 'llm.sqlite'))
+    cache.store(request('hello'), completion('HI'))
+
+    assert cache.lookup(request('hello')).choices[0].message.content == 'HI'
+    assert cache.lookup({**request('hello'), 'max_tokens': 1}) is None
+    # sampled requests are not cached in read_write mode
+    cache.store(request('hello', temperature=1), completion('HEY'))
+    assert cache.lookup(request('hello', temperature=1)) is None
+
+def test_cache_ttl_and_size_eviction(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / 'llm.sqlite'), ttl=0)
+    cache.store(request('old'), completion('OLD'))
+    assert cache.lookup(request('old')) is None
+
+    cache = LLMResponseCache(str(tmp_path / 'small.sqlite'), max_entries=10)
+    for i in range(25):
+        cache.store(request(str(i)), completion(str(i)))
+    assert cache.stats()['entries'] <= 10
+    assert cache.lookup(request('24')) is not None
+
+def test_replay_serves_recorded_responses_offline(tmp_path, monkeypatch):
+    path = str(tmp_path / 'llm.sqlite')
+    transport = CountingTransport()
+    monkeypatch.setattr(get_config(), 'async_transport', transport)
+
+    monkeypatch.setattr(get_config(), 'llm_cache', LLMResponseCache(path, mode='record'))
+    assert complete_many(['a', 'b'], temperature=0) == ['A', 'B']
+
+    monkeypatch.setattr(get_config(), 'llm_cache', LLMResponseCache(path, mode='replay'))
+    assert complete_many(['a', 'b'], temperature=0) == ['A', 'B']
+    assert transport.calls == 2
+
+    with pytest.raises(Error):
+        complete_many(['c'], temperature=0)
+
+class LogprobTransport:
+    # one-token replies with a top-logprob distribution over '3' and '2'
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, **request):
+        import math
+
+        self.calls += 1
+        top = [SimpleNamespace(token='3', logprob=math.log(0.75)), SimpleNamespace(token='2', logprob=math.log(0.25))]
+        logprobs = SimpleNamespace(content=[SimpleNamespace(token='3', logprob=top[0].logprob, top_logprobs=top)])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='3'), logprobs=logprobs)])
+
+def test_replayed_constrained_scores_keep_logprobs(tmp_path, monkeypatch):
+    import evalbench.metrics.predefined.response_quality as response_quality
+
+    path = str(tmp_path / 'llm.sqlite')
+    transport = LogprobTransport()
+    monkeypatch.setattr(get_config(), 'async_transport', transport)
+    monkeypatch.setattr(get_config(), 'judge_scoring', 'constrained')
+
+    monkeypatch.setattr(get_config(), 'llm_cache', LLMResponseCache(path, mode='record'))
+    recorded = response_quality.coherence_score(['A response.'])
+
+    monkeypatch.setattr(get_config(), 'llm_cache', LLMResponseCache(path, mode='replay'))
+    # the expected score over the top logprobs, not the sampled '3'
+    assert response_quality.coherence_score(['A response.']) == recorded == [2.75]
+    assert transport.calls == 1
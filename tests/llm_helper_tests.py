@@ -0,0 +1,192 @@
+import asyncio
+import json
+import math
+import random
+import pytest
+from types import SimpleNamespace
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.llm_helper import complete_many
+
+def completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+class EchoTransport:
+    # replies with the prompt's last line after a random delay, tracking concurrency
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, **request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(random.uniform(0, 0.01))
+        self.in_flight -= 1
+        return completion(request['messages'][0]['content'].splitlines()[-1])
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = EchoTransport()
+    monkeypatch.setattr(get_config(), 'async_transport', transport)
+    return transport
+
+def test_complete_many_preserves_order_with_bounded_concurrency(transport):
+    prompts = [f'Rate this\n{i}' for i in range(50)]
+    assert complete_many(prompts, temperature=0, concurrency=4) == [str(i) for i in range(50)]
+    assert transport.peak <= 4
+
+def test_judge_metric_keeps_sync_signature(transport):
+    import evalbench.metrics.predefined.response_quality as response_quality
+
+    # the echoed last prompt line ('Rating:') is not a number
+    assert response_quality.coherence_score(['A response.']) == ['Invalid score']
+
+class PackedJudge:
+    # answers packed prompts with a JSON array (one off-scale score) and single prompts with '2'
+    def __init__(self):
+        self.prompts = []
+
+    async def __call__(self, **request):
+        prompt = request['messages'][0]['content']
+        self.prompts.append(prompt)
+        count = prompt.count('Item ')
+        if count:
+            return completion(json.dumps([3] * (count - 1) + [9]))
+        return completion('2')
+
+def test_packed_judge_prompts_fall_back_per_item(monkeypatch):
+    import evalbench.metrics.predefined.response_quality as response_quality
+    from evalbench.utils.enum import Conciseness
+
+    judge = PackedJudge()
+    monkeypatch.setattr(get_config(), 'async_transport', judge)
+    monkeypatch.setattr(get_config(), 'judge_pack_size', 4)
+
+    concise, fallback = f'3.0 - {Conciseness.VERY_CONCISE.description}', f'2.0 - {Conciseness.SOMEWHAT_CONCISE.description}'
+    results = response_quality.conciseness_score([f'Response {i}.' for i in range(6)])
+    assert results == [concise] * 3 + [fallback] + [concise, fallback]
+    # two packed prompts plus one fallback call per off-scale item
+    assert len(judge.prompts) == 4
+
+def test_parse_packed_scores_checks_length_and_scale():
+    from evalbench.utils.enum import Relevance
+    from evalbench.utils.judge_helper import parse_packed_scores
+
+    assert parse_packed_scores('Scores: [5, "2", 7]', 3, Relevance) == [5.0, 2.0, None]
+    assert parse_packed_scores('[1, 2]', 3, Relevance) == [None] * 3
+    assert parse_packed_scores('no scores', 2, Relevance) == [None, None]
+
+class FusedJudge:
+    # answers multi-criteria prompts with a JSON object; coherence is off-scale for the second item
+    def __init__(self):
+        self.prompts = []
+
+    async def __call__(self, **request):
+        prompt = request['messages'][0]['content']
+        self.prompts.append(prompt)
+        if 'Criterion "' in prompt:
+            coherence = 7 if 'second' in prompt else 2
+            return completion(json.dumps({'conciseness': 3, 'coherence': coherence}))
+        return completion('1')
+
+def test_evaluate_module_fuses_judges_over_same_inputs(monkeypatch):
+    from evalbench.metrics.evaluate_module import evaluate_module
+    from evalbench.utils.enum import Coherence, Conciseness
+
+    judge = FusedJudge()
+    monkeypatch.setattr(get_config(), 'async_transport', judge)
+
+    results = {r['metric']: r.get('result') for r in evaluate_module(['response_quality'], response=['first', 'second'])}
+    assert results['conciseness_score'] == [f'3.0 - {Conciseness.VERY_CONCISE.description}'] * 2
+    assert results['coherence_score'] == [f'2.0 - {Coherence.SOMEWHAT_COHERENT.description}', f'1.0 - {Coherence.INCOHERENT.description}']
+    # one fused call per response, plus a single-criterion fallback for the unreadable score
+    assert len(judge.prompts) == 3
+    # the rubrics' "only the number" directions would contradict the JSON reply
+    assert not any('only the number' in prompt.lower() for prompt in judge.prompts[:2])
+
+def test_fused_prefetch_records_transport_failures(monkeypatch):
+    import evalbench
+    from evalbench.runtime_setup.run_scope import get_run_cache, run_scope
+    from evalbench.utils.judge_helper import FusedScores, prefetch_fused_scores
+
+    async def unreachable(**request):
+        raise ConnectionError('judge unreachable')
+
+    monkeypatch.setattr(get_config(), 'async_transport', unreachable)
+    monkeypatch.setattr(get_config(), 'llm_max_retries', 0)
+    for name in ('conciseness_score', 'coherence_score'):
+        evalbench.metric_registry[name]['func']
+    metrics = [evalbench.metric_registry[name] for name in ('conciseness_score', 'coherence_score')]
+
+    with run_scope():
+        with pytest.warns(UserWarning, match='Fused judge call'):
+            prefetch_fused_scores(metrics, {'response': ['first']})
+        assert get_run_cache('judge_scores', FusedScores).stats()['failures'] == 1
+
+    class AuthError(Exception):
+        status_code = 401
+
+    async def unauthorized(**request):
+        raise AuthError('invalid api key')
+
+    # not worth retrying, but still a failed call rather than a bug
+    monkeypatch.setattr(get_config(), 'async_transport', unauthorized)
+    with run_scope():
+        with pytest.warns(UserWarning, match='Fused judge call'):
+            prefetch_fused_scores(metrics, {'response': ['first']})
+        assert get_run_cache('judge_scores', FusedScores).stats()['failures'] == 1
+
+    async def broken(**request):
+        raise KeyError('choices')
+
+    # anything but a transport error is a bug, not a fallback case
+    monkeypatch.setattr(get_config(), 'async_transport', broken)
+    with run_scope(), pytest.raises(KeyError):
+        prefetch_fused_scores(metrics, {'response': ['first']})
+
+def test_format_scores_keeps_rows_aligned():
+    from evalbench.utils.enum import Relevance
+    from evalbench.utils.judge_helper import format_scores
+
+    results = format_scores(['Rating: 4', '9', 'I think it is relevant', '2/5'], Relevance)
+    assert results[0].startswith('4.0') and results[3].startswith('2.0')
+    assert results[1:3] == ['Invalid score', 'Invalid score']
+
+class LogprobJudge:
+    # one-token replies with a top-logprob distribution over '3' and ' 2'
+    def __init__(self):
+        self.requests = []
+
+    async def __call__(self, **request):
+        self.requests.append(request)
+        top = [SimpleNamespace(token='3', logprob=math.log(0.75)), SimpleNamespace(token=' 2', logprob=math.log(0.2)),
+               SimpleNamespace(token='The', logprob=math.log(0.05))]
+        logprobs = SimpleNamespace(content=[SimpleNamespace(token='3', logprob=top[0].logprob, top_logprobs=top)])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='3'), logprobs=logprobs)])
+
+def test_constrained_scoring_uses_logprobs(monkeypatch):
+    import evalbench.metrics.predefined.response_quality as response_quality
+
+    judge = LogprobJudge()
+    monkeypatch.setattr(get_config(), 'async_transport', judge)
+    monkeypatch.setattr(get_config(), 'judge_scoring', 'constrained')
+
+    # (3 * 0.75 + 2 * 0.2) / 0.95
+    assert response_quality.coherence_score(['A response.']) == [round(2.65 / 0.95, 2)]
+    assert judge.requests[0]['max_tokens'] == 1 and judge.requests[0]['top_logprobs'] == 5
+
+def test_fused_prefetch_failure_leaves_per_metric_errors(monkeypatch):
+    from evalbench.metrics.evaluate_module import evaluate_module
+
+    class AuthError(Exception):
+        status_code = 401
+
+    async def unauthorized(**request):
+        raise AuthError('invalid api key')
+
+    monkeypatch.setattr(get_config(), 'async_transport', unauthorized)
+    with pytest.warns(UserWarning, match='Fused judge call'):
+        results = {r['metric']: r for r in evaluate_module(['response_quality'], response=['first', 'second'])}
+
+    # the run completes; each judge reports the failure as its own error entry
+    assert results['conciseness_score']['result'] == {'error': 'invalid api key'}
+    assert results['coherence_score']['result'] == {'error': 'invalid api key'}
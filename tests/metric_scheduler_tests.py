@@ -0,0 +1,66 @@
+import time
+import threading
+import evalbench
+from evalbench.metrics.evaluate_module import evaluate_module
+from evalbench.runtime_setup.config import EvalConfig
+from evalbench.runtime_setup.run_scope import get_active_run, run_scope
+from evalbench.runtime_setup.runtime import get_config, set_config
+from evalbench.utils.metric_scheduler import run_scheduled
+
+def _waiter(name, barrier, threads):
+    def metric(response):
+        threads.add(threading.current_thread().name)
+        assert get_active_run() is not None
+        # only returns once all three classes are running at the same time
+        barrier.wait()
+        return [name] * len(response)
+    return metric
+
+def _register(monkeypatch, threads):
+    barrier = threading.Barrier(3, timeout=10)
+    for name, resource in [('slow_judge', 'io'), ('slow_lexical', 'cpu'), ('slow_model', 'model'), ('broken', 'cpu')]:
+        func = _waiter(name, barrier, threads) if name != 'broken' else lambda response: 1 / 0
+        monkeypatch.setitem(evalbench.metric_registry, f'{name}_score', {
+            'func': func,
+            'required_args': ['response'],
+            'arg_types': [list],
+            'module': 'scheduler_test',
+            'resource': resource,
+        })
+
+def test_evaluate_module_overlaps_resource_classes(monkeypatch):
+    threads = set()
+    _register(monkeypatch, threads)
+    previous = get_config()
+    set_config(EvalConfig(groq_api_key='test', judge_fusion=False))
+    try:
+        with run_scope() as run:
+            results = evaluate_module(['scheduler_test'], response=['a', 'b'])
+            report = run.stats()['schedule']
+    finally:
+        set_config(previous)
+
+    assert [r['metric'] for r in results] == ['slow_judge_score', 'slow_lexical_score', 'slow_model_score', 'broken_score']
+    # run one after another, the first metric would break the barrier on its timeout
+    assert [r.get('result') for r in results[:3]] == [['slow_judge'] * 2, ['slow_lexical'] * 2, ['slow_model'] * 2]
+    assert 'division by zero' in results[3]['error']
+    assert {name.split('_')[0] for name in threads} == {'evalbench-io', 'evalbench-cpu', 'evalbench-model'}
+    assert set(report['classes']) == {'io', 'cpu', 'model'}
+
+def test_setup_runs_before_its_class_and_serial_mode_keeps_order():
+    events = []
+
+    def task(name):
+        def run():
+            events.append(name)
+            return name
+        return run
+
+    setup = {'io': lambda: (time.sleep(0.05), events.append('setup'))}
+    tasks = [('judge', 'io', task('judge')), ('lexical', 'cpu', task('lexical'))]
+    assert run_scheduled(tasks, {'io': 2, 'cpu': 1}, setup) == ['judge', 'lexical']
+    assert events.index('setup') < events.index('judge')
+
+    events.clear()
+    assert run_scheduled(tasks, None, setup) == ['judge', 'lexical']
+    assert events == ['setup', 'judge', 'lexical']
@@ -0,0 +1,52 @@
+import pytest
+from evalbench.runtime_setup.model_pool import ModelPool, model_key, estimate_model_bytes, pooled_resource
+import evalbench.runtime_setup.model_pool as model_pool
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = ModelPool()
+    monkeypatch.setattr(model_pool, '_pool', pool)
+    return pool
+
+def test_same_key_shares_instance(pool):
+    key = model_key('sentence_transformer', 'mini')
+    first = pool.acquire(key, lambda: FakeModel('mini'))
+    second = pool.acquire(key, lambda: FakeModel('other'))
+    assert first is second
+    assert pool.stats()['loads'] == 1
+    assert pool.stats()['hits'] == 1
+
+def test_lru_eviction_skips_models_in_use(pool, monkeypatch):
+    monkeypatch.setattr(model_pool, 'estimate_model_bytes', lambda model: 2**20)
+    pool.resize(2)
+
+    a, b, c = (model_key('nli', name) for name in 'abc')
+    pool.acquire(a, lambda: FakeModel('a'))
+    pool.acquire(b, lambda: FakeModel('b'))
+    pool.release(b)
+    pool.acquire(c, lambda: FakeModel('c'))
+
+    # 'a' is still referenced, so the idle 'b' is evicted instead
+    assert pool.stats()['models'] == 2
+    assert pool.stats()['evictions'] == 1
+    assert pool.acquire(b, lambda: FakeModel('b2')).name == 'b2'
+
+def test_pooled_resource_shares_and_releases(pool):
+    key = model_key('sentence_transformer', 'mini')
+    first = pooled_resource('sentence_model', key, lambda: FakeModel('mini'))
+    second = pooled_resource('sentence_model', key, lambda: FakeModel('mini'))
+
+    assert not first.loaded
+    assert first.resolve() is second.resolve()
+    assert pool.stats()['in_use'] == 1
+
+    first.release()
+    second.release()
+    assert pool.stats()['in_use'] == 0
+
+def test_estimate_model_bytes_without_parameters():
+    assert estimate_model_bytes(FakeModel('mini')) == 0
@@ -21,4 +21,74 @@ def test_data():
 def test_context_relevance(test_data):
     score = query_alignment.context_relevance_score(test_data['queries'], test_data['contexts'])
     assert all(isinstance(s, str) for s in score), \
-        f'Expected relevance scores to be string in [1, 5], but got {score}'
\ No newline at end of file
+        f'Expected relevance scores to be string in [1, 5], but got {score}'
+
+class TopicModel:
+    # one-hot embeddings by topic word, so similarity is 1 within a topic and 0 across
+    topics = ['heat', 'speaking', 'paris']
+
+    def encode(self, texts, **kwargs):
+        import numpy as np
+        return np.array([[1.0 if topic in text.lower() else 0.0 for topic in self.topics] + [0.1] for text in texts])
+
+class CountingJudge:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, **request):
+        from types import SimpleNamespace
+        self.calls += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='3'))])
+
+def test_relevance_cascade_skips_confident_pairs(monkeypatch):
+    from evalbench.runtime_setup.runtime import get_config
+    from evalbench.runtime_setup.run_scope import run_scope
+
+    cfg = get_config()
+    judge = CountingJudge()
+    monkeypatch.setattr(cfg, 'sentence_model', TopicModel())
+    monkeypatch.setattr(cfg, 'embedding_cache', None)
+    monkeypatch.setattr(cfg, 'async_transport', judge)
+    monkeypatch.setattr(cfg, 'relevance_cascade_bands', (0.2, 0.95))
+
+    queries = ['Heat stroke symptoms?', 'Public speaking tips?', 'Heat and speaking?']
+    contexts = ['Heat stroke causes confusion.', 'The Eiffel Tower is in Paris.', 'Heat waves hit Paris.']
+    with run_scope() as run:
+        scores = query_alignment.context_relevance_score(queries, contexts)
+        stats = run.stats()['cascade']
+
+    assert scores[0].startswith('5.0') and scores[1].startswith('1.0') and scores[2].startswith('3.0')
+    assert judge.calls == 1
+    assert stats['judged'] == 1 and stats['avoided_share'] == round(2 / 3, 4)
+
+def test_cascaded_judges_stay_out_of_fused_prompts(monkeypatch):
+    from evalbench.metrics.evaluate_module import evaluate_module
+    from evalbench.runtime_setup.runtime import get_config
+    from evalbench.runtime_setup.run_scope import run_scope
+
+    cfg = get_config()
+    judge = CountingJudge()
+    monkeypatch.setattr(cfg, 'sentence_model', TopicModel())
+    monkeypatch.setattr(cfg, 'embedding_cache', None)
+    monkeypatch.setattr(cfg, 'async_transport', judge)
+    monkeypatch.setattr(cfg, 'relevance_cascade_bands', (0.2, 0.95))
+    monkeypatch.setattr(cfg, 'judge_fusion', True)
+
+    queries = ['Heat stroke symptoms?', 'Public speaking tips?', 'Heat and speaking?']
+    responses = ['Heat stroke causes confusion.', 'The Eiffel Tower is in Paris.', 'Heat waves hit Paris.']
+    with run_scope() as run:
+        evaluate_module(['response_alignment'], query=queries, response=responses)
+        stats = run.stats()
+
+    # one relevance pair left after the pre-filter, plus helpfulness for every pair
+    assert judge.calls == 1 + 3
+    assert stats['cascade']['judged'] == 1
+    assert stats.get('judge_scores', {}).get('fused_calls', 0) == 0
+
+def test_calibrate_bands():
+    from evalbench.utils.cascade_helper import calibrate_bands
+
+    similarities = [i / 100 for i in range(100)]
+    scores = [1] * 30 + [3] * 40 + [5] * 30
+    low, high = calibrate_bands(similarities, scores, lowest=1, highest=5, precision=1.0)
+    assert (low, high) == (0.30, 0.70)
@@ -0,0 +1,71 @@
+import pytest
+from types import SimpleNamespace
+from evalbench.runtime_setup.runtime import get_config
+from evalbench.utils.llm_helper import complete_many
+from evalbench.utils.rate_limit import AdaptiveConcurrency, RateLimiter, TokenBucket, parse_duration
+
+class APIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f'status {status_code}')
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+class FlakyTransport:
+    # fails the first `failures` calls with `status`, then echoes the prompt
+    def __init__(self, failures, status=429):
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+
+    async def __call__(self, **request):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise APIError(self.status, {'retry-after': '0'})
+        content = request['messages'][0]['content']
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    cfg = get_config()
+    monkeypatch.setattr(cfg, 'llm_retry_base_delay', 0.001)
+    monkeypatch.setattr(cfg, 'llm_max_retries', 3)
+    return cfg
+
+def test_parse_duration():
+    assert parse_duration('2m59.56s') == pytest.approx(179.56)
+    assert parse_duration('120ms') == pytest.approx(0.12)
+    assert parse_duration('7') == 7
+    assert parse_duration(None) is None
+
+def test_throttled_requests_are_retried(fast_retries, monkeypatch):
+    transport = FlakyTransport(failures=2)
+    monkeypatch.setattr(fast_retries, 'async_transport', transport)
+
+    assert complete_many(['a'], temperature=0) == ['a']
+    assert transport.calls == 3
+
+def test_client_errors_are_not_retried(fast_retries, monkeypatch):
+    transport = FlakyTransport(failures=1, status=400)
+    monkeypatch.setattr(fast_retries, 'async_transport', transport)
+
+    with pytest.raises(APIError):
+        complete_many(['a'], temperature=0)
+    assert transport.calls == 1
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate_per_minute=60)
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(30) == pytest.approx(30, abs=0.1)
+
+def test_rate_limiter_follows_headers():
+    limiter = RateLimiter(requests_per_minute=100)
+    limiter.update_from_headers({'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '1.5s'})
+    assert limiter.requests.reserve(1) == pytest.approx(1.5, abs=0.1)
+
+def test_adaptive_concurrency_backs_off_and_recovers():
+    concurrency = AdaptiveConcurrency(maximum=8)
+    concurrency.on_throttle()
+    assert concurrency.limit == 4
+    for _ in range(100):
+        concurrency.on_success(0.1)
+    assert concurrency.limit == 8
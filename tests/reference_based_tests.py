@@ -1,5 +1,6 @@
 import pytest
 from evalbench import metrics as reference_based
+import evalbench.metrics.predefined.reference_based as predefined
 
 @pytest.fixture
 def test_data():
@@ -42,4 +43,67 @@ def test_bert_score(test_data):
     score = reference_based.bert_score(test_data['reference'], test_data['generated'])
     for score_dict in score:
         for key in ['precision', 'recall', 'f1']:
-            assert 0.0 <= score_dict[key] <= 1.0, f'{key} out of range: {score_dict[key]}'
\ No newline at end of file
+            assert 0.0 <= score_dict[key] <= 1.0, f'{key} out of range: {score_dict[key]}'
+
+def test_process_pool_matches_in_process(monkeypatch, test_data):
+    from evalbench.runtime_setup.runtime import get_config
+    from evalbench.utils import lexical_helper
+    from evalbench.utils.parallel_helper import map_rows
+
+    monkeypatch.setattr(get_config(), 'parallel_min_batch', 1)
+    # workers are capped at the CPU count; keep the pool on single-core machines
+    monkeypatch.setattr('os.cpu_count', lambda: 2)
+    reference, generated = test_data['reference'] * 4, test_data['generated'] * 4
+    for kernel in (lexical_helper.bleu_rows, lexical_helper.rouge_rows):
+        in_process = map_rows(kernel, reference, generated, workers=0)
+        # chunks of 5 rows split the batch unevenly across the workers
+        pooled = map_rows(kernel, reference, generated, workers=2, chunk_size=5)
+        assert pooled == in_process
+
+class FakeEncoder:
+    # one-hot embedding per distinct word count, recording every encode call
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size, **options):
+        import numpy as np
+
+        self.calls.append((list(texts), batch_size))
+        return np.array([np.eye(8)[len(text.split())] for text in texts])
+
+def test_semantic_similarity_encodes_distinct_strings_once(monkeypatch):
+    from evalbench.runtime_setup.runtime import get_config
+
+    encoder = FakeEncoder()
+    monkeypatch.setattr(get_config(), 'sentence_model', encoder)
+    monkeypatch.setattr(get_config(), 'embedding_cache', None)
+
+    reference = ['the cat sat', 'the cat sat', 'the cat sat']
+    generated = ['a cat sat', 'the dog', 'the cat sat']
+    score = predefined.semantic_similarity_score(reference, generated, batch_size=32)
+
+    assert score == [1.0, 0.0, 1.0]
+    assert encoder.calls == [(['the cat sat', 'a cat sat', 'the dog'], 32)]
+
+def test_bert_scorer_is_loaded_once_across_calls(monkeypatch, test_data):
+    import numpy as np
+    from evalbench.runtime_setup.resources import LazyResource
+    from evalbench.runtime_setup.runtime import get_config
+
+    class FakeScorer:
+        def __init__(self):
+            self.calls = 0
+
+        def score(self, generated, reference, verbose=False):
+            self.calls += 1
+            values = np.full(len(generated), 0.5)
+            return values, values, values
+
+    loads = []
+    scorer = FakeScorer()
+    monkeypatch.setattr(get_config(), 'bert_scorer', LazyResource('bert_scorer', lambda: loads.append(1) or scorer))
+
+    for _ in range(2):
+        score = predefined.bert_score(test_data['reference'], test_data['generated'])
+        assert score == [{'precision': 0.5, 'recall': 0.5, 'f1': 0.5}] * 3
+    assert loads == [1] and scorer.calls == 2
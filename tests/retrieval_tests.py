@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import evalbench.metrics.predefined.retrieval as retrieval
 
 @pytest.fixture
@@ -31,4 +32,85 @@ def test_mrr(test_data):
     score = retrieval.mrr_score(test_data['relevant_docs'], test_data['retrieved_docs'], test_data['k'])
     expected = [0.0, 0.5, 1.0]
     assert all(abs(a - b) < 1e-5 for a, b in zip(score, expected)), \
-        f'Expected {expected}, got {score}'
\ No newline at end of file
+        f'Expected {expected}, got {score}'
+
+def test_metrics_share_one_hit_matrix_per_run():
+    from evalbench.runtime_setup.run_scope import run_scope
+
+    relevant = [['a', 'b'], ['c'], [], ['d', 'd']]
+    retrieved = [['b', 'b', 'x', 'a'], ['x', 'y'], ['a'], ['d', 'z', 'd']]
+    with run_scope() as run:
+        recall = retrieval.recall_at_k(relevant, retrieved, 3)
+        precision = retrieval.precision_at_k(relevant, retrieved, 3)
+        ndcg = retrieval.ndcg_at_k(relevant, retrieved, 3)
+        mrr = retrieval.mrr_score(relevant, retrieved, 3)
+        assert run.stats()['retrieval']['builds'] == 1
+
+    # repeated documents count once for recall/precision and at every rank for nDCG
+    assert recall == [0.5, 0.0, 0.0, 0.5]
+    assert precision == [0.33, 0.0, 0.0, 0.33]
+    assert ndcg == [1.0, 0.0, 0.0, 0.92]
+    assert mrr == [1.0, 0.0, 0.0, 1.0]
+
+def test_retrieval_curves_match_single_cutoff_metrics():
+    import random
+    from evalbench.utils.retrieval_helper import retrieval_curves
+
+    rng = random.Random(0)
+    relevant = [[f'd{rng.randrange(30)}' for _ in range(rng.randrange(1, 6))] for _ in range(200)]
+    retrieved = [[f'd{rng.randrange(30)}' for _ in range(rng.randrange(1, 25))] for _ in range(200)]
+    cutoffs = [1, 3, 5, 10, 20]
+
+    curves = retrieval_curves(relevant, retrieved, cutoffs)
+    assert curves['ndcg'].shape == (200, len(cutoffs))
+    for k in cutoffs:
+        at_k = curves.at(k)
+        assert [round(float(v), 2) for v in at_k['recall']] == retrieval.recall_at_k(relevant, retrieved, k)
+        assert [round(float(v), 2) for v in at_k['precision']] == retrieval.precision_at_k(relevant, retrieved, k)
+        assert [round(float(v), 2) for v in at_k['ndcg']] == retrieval.ndcg_at_k(relevant, retrieved, k)
+        assert [round(float(v), 2) for v in at_k['mrr']] == retrieval.mrr_score(relevant, retrieved, k)
+
+def test_graded_ndcg_takes_ideal_from_grades():
+    relevant = [['a', 'b']]
+    retrieved = [['b', 'x', 'a']]
+    grades = [{'a': 2, 'b': 1}]
+    # gains 1, 0, 3 against the ideal 3, 1
+    expected = (1 + 3 / 2) / (3 + 1 / np.log2(3))
+    assert retrieval.ndcg_at_k(relevant, retrieved, 3, relevance_grades=grades) == [round(expected, 2)]
+    assert retrieval.ndcg_at_k(relevant, retrieved, 3) == [0.92]
+
+def test_evaluate_trec_streams_run_and_qrels(tmp_path):
+    import gzip
+    import json
+    from evalbench.utils.trec_loader import evaluate_trec, iter_trec_chunks
+
+    qrels = tmp_path / 'qrels.txt'
+    qrels.write_text('q1 0 d1 2\nq1 0 d2 1\nq1 0 d9 0\nq2 0 d3 1\n')
+    run = tmp_path / 'run.txt.gz'
+    with gzip.open(run, 'wt') as f:
+        # q1 lines out of order: ranking follows the scores
+        f.write('q1 Q0 d2 2 1.5 sys\nq1 Q0 d1 1 2.0 sys\nq1 Q0 d7 3 0.5 sys\n')
+        f.write('q2 Q0 d4 1 3.0 sys\nq2 Q0 d3 2 2.0 sys\nq3 Q0 d1 1 1.0 sys\n')
+    run_jsonl = tmp_path / 'run.jsonl'
+    run_jsonl.write_text('\n'.join(json.dumps(line) for line in [
+        {'query_id': 'q1', 'docs': ['d1', 'd2', 'd7']},
+        {'query_id': 'q2', 'docs': ['d4', 'd3']},
+    ]))
+
+    chunks = list(iter_trec_chunks(run, qrels, chunk_size=1))
+    assert [chunk['query_ids'] for chunk in chunks] == [['q1'], ['q2']]
+
+    result = evaluate_trec(run, qrels, cutoffs=[1, 2], metrics=['recall', 'ndcg', 'mrr'])
+    assert result == evaluate_trec(run_jsonl, qrels, cutoffs=[1, 2], metrics=['recall', 'ndcg', 'mrr'])
+    assert result['queries'] == 2
+    assert result['recall'] == {1: 0.25, 2: 1.0}
+    assert result['mrr'] == {1: 0.5, 2: 0.75}
+    assert result['ndcg'][1] == 0.5
+
+def test_iter_run_rejects_split_queries(tmp_path):
+    from evalbench.utils.trec_loader import iter_run
+
+    run = tmp_path / 'run.txt'
+    run.write_text('q1 Q0 d1 1 1.0 sys\nq2 Q0 d1 1 1.0 sys\nq1 Q0 d2 2 0.5 sys\n')
+    with pytest.raises(ValueError):
+        list(iter_run(run))
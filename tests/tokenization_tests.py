@@ -0,0 +1,22 @@
+from evalbench.runtime_setup.run_scope import run_scope
+from evalbench.utils.tokenization import get_token_cache, stem_tokens
+
+def test_cache_is_shared_within_a_run():
+    with run_scope() as run:
+        assert stem_tokens('The cats are running') == ['the', 'cat', 'are', 'run']
+        stem_tokens('The cats are running')
+        assert get_token_cache() is get_token_cache()
+        stats = run.stats()['tokens']['stems']
+
+    assert stats == {'entries': 1, 'hits': 1, 'misses': 1}
+
+def test_no_sharing_outside_a_run():
+    assert get_token_cache() is not get_token_cache()
+
+def test_rouge_tokenizer_matches_stemmed_scorer():
+    from rouge_score import rouge_scorer
+
+    reference, generated = 'The cats are running home', 'A cat runs home'
+    expected = rouge_scorer.RougeScorer(['rouge1', 'rougeL'], use_stemmer=True).score(reference, generated)
+    cached = rouge_scorer.RougeScorer(['rouge1', 'rougeL'], tokenizer=get_token_cache().rouge_tokenizer())
+    assert cached.score(reference, generated) == expected